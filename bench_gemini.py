@@ -0,0 +1,131 @@
+"""
+Gemini Service Benchmark
+Runs extraction and meaning jobs against the local fake backend, so
+throughput, concurrency and retry behaviour can be measured offline
+"""
+
+import contextlib
+import io
+import time
+from services.fake_gemini import FakeGeminiClient, fixed_latency, lognormal_latency
+from services.gemini_service import GeminiService
+from services.key_scheduler import KeyScheduler
+
+def make_factory(**options):
+    """Return a client factory with one fake client per key, and the clients"""
+    clients = {}
+
+    def factory(api_key):
+        if api_key not in clients:
+            clients[api_key] = FakeGeminiClient(api_key=api_key, seed=len(clients), **options)
+        return clients[api_key]
+
+    return factory, clients
+
+def total_stats(clients):
+    """Sum call counters over all fake clients"""
+    totals = {}
+    for client in clients.values():
+        for name, value in client.stats().items():
+            if name != 'in_flight':
+                totals[name] = totals.get(name, 0) + value
+    return totals
+
+def synthetic_word(i):
+    """Distinct letters-only word for each number"""
+    letters = ''
+    while True:
+        i, digit = divmod(i, 26)
+        letters += chr(ord('a') + digit)
+        if not i:
+            return f"vocab{letters}"
+
+def synthetic_words(count):
+    return [synthetic_word(i) for i in range(count)]
+
+def synthetic_chunks(count, words_per_chunk=200):
+    return [
+        ' '.join(f"{synthetic_word((c * words_per_chunk + i) % 5000)} and the" for i in range(words_per_chunk))
+        for c in range(count)
+    ]
+
+def quiet(func, *args, **kwargs):
+    """Run func without the service's progress prints"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+def bench_extraction():
+    print("Extraction: 32 chunks, 0.2 s latency")
+    print(f"{'workers':>10} {'seconds':>10} {'words':>10} {'calls':>8} {'in flight':>10}")
+    chunks = synthetic_chunks(32)
+    for workers in (1, 4, 8):
+        factory, clients = make_factory(latency=fixed_latency(0.2))
+        gemini = GeminiService('bench-key', client_factory=factory)
+        started = time.perf_counter()
+        words = quiet(gemini.extract_important_words_chunked, chunks, max_workers=workers)
+        elapsed = time.perf_counter() - started
+        stats = total_stats(clients)
+        print(f"{workers:>10} {elapsed:>10.2f} {len(words):>10} {stats['calls']:>8} {stats['max_in_flight']:>10}")
+
+def bench_meanings_concurrency():
+    print("Meanings: 1000 words in batches of 50, log-normal latency (median 0.3 s)")
+    print(f"{'in flight':>10} {'seconds':>10} {'found':>10} {'calls':>8}")
+    words = synthetic_words(1000)
+    for concurrency in (1, 4, 8):
+        factory, clients = make_factory(latency=lognormal_latency(0.3))
+        gemini = GeminiService('bench-key', client_factory=factory)
+        started = time.perf_counter()
+        meanings = quiet(gemini.fetch_word_meanings_batch, words, batch_size=50, max_concurrency=concurrency)
+        elapsed = time.perf_counter() - started
+        print(f"{concurrency:>10} {elapsed:>10.2f} {len(meanings):>10} {total_stats(clients)['calls']:>8}")
+
+def bench_streaming():
+    print("Streaming: time to first word, 200 words in batches of 50, 0.5 s + 20 ms per chunk")
+    words = synthetic_words(200)
+    for streaming in (False, True):
+        factory, _ = make_factory(latency=fixed_latency(0.5), stream_chunk_chars=48, chunk_delay=0.02)
+        gemini = GeminiService('bench-key', client_factory=factory)
+        started = time.perf_counter()
+        first = {}
+
+        def on_word(word, entry):
+            first.setdefault('at', time.perf_counter() - started)
+
+        if streaming:
+            quiet(gemini.fetch_word_meanings_batch, words, batch_size=50, on_word=on_word)
+        else:
+            quiet(gemini.fetch_word_meanings_batch, words, batch_size=50)
+            first['at'] = time.perf_counter() - started
+        total = time.perf_counter() - started
+        label = 'streamed' if streaming else 'buffered'
+        print(f"{label:>10} first word {first['at']:.2f} s, all words {total:.2f} s")
+
+def bench_faults():
+    print("Faults: 3 keys, 5% errors, 10% 429s, 20% truncated, 1000 words")
+    words = synthetic_words(1000)
+    keys = ['key-a', 'key-b', 'key-c']
+    factory, clients = make_factory(
+        latency=lognormal_latency(0.1), error_rate=0.05, rate_limit_rate=0.10, truncate_rate=0.20
+    )
+    scheduler = KeyScheduler(keys, requests_per_minute=600, tokens_per_minute=10_000_000,
+                             rate_limit_cooldown=0.5)
+    gemini = GeminiService(keys[0], key_scheduler=scheduler, client_factory=factory)
+    started = time.perf_counter()
+    meanings = quiet(gemini.fetch_word_meanings_batch, words, batch_size=50, max_concurrency=2)
+    elapsed = time.perf_counter() - started
+    stats = total_stats(clients)
+    print(f"  {elapsed:.2f} s, {len(meanings)}/{len(words)} words found")
+    print(f"  calls {stats['calls']}, errors {stats['errors']}, "
+          f"429s {stats['rate_limited']}, truncated {stats['truncated']}")
+
+def main():
+    """Run all scenarios"""
+    print("=" * 60)
+    print("Gemini Service Benchmark (fake backend)")
+    print("=" * 60)
+    for bench in (bench_extraction, bench_meanings_concurrency, bench_streaming, bench_faults):
+        bench()
+        print("-" * 60)
+
+if __name__ == '__main__':
+    main()
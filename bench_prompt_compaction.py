@@ -0,0 +1,108 @@
+"""
+Prompt Compaction Report
+Shows estimated extraction prompt tokens per film before and after
+sentence-level compaction
+
+Usage:
+    python bench_prompt_compaction.py film1.srt film2.srt ...
+Without arguments a synthetic film is used, and a regression check runs
+on a film whose lines have no end punctuation
+"""
+
+import os
+import random
+import sys
+import tempfile
+from processors.candidate_filter import CandidateFilter
+from processors.frequency_table import get_common_words
+from processors.srt_processor import SRTProcessor
+from services.gemini_service import EXTRACT_CHUNK_TOKENS
+
+INTERJECTIONS = ["- Hey! - What?", "Come on, come on!", "I don't know.", "Okay, okay.", "Oh my God.", "Yeah.", "No, no, no."]
+SUBJECTS = ["I", "We", "They", "You", "The captain", "My brother", "Nobody", "The old man"]
+VERBS = ["found", "hid", "stole", "needed", "remembered", "destroyed", "followed", "betrayed", "protected", "searched"]
+OBJECTS = [
+    "the treasure", "the map", "the lighthouse", "the smugglers", "the harbour", "the letter",
+    "the keeper", "the village", "the storm", "the compass", "the ship", "the island",
+]
+ENDINGS = ["yesterday", "before dawn", "again", "at night", "for years", "in the cellar", "without a word", ""]
+
+def synthetic_line(rng):
+    """Random dialogue line; common words appear far more often (Zipf-like)"""
+    if rng.random() < 0.3:
+        return rng.choice(INTERJECTIONS)
+    pick = lambda words: words[min(len(words) - 1, int(rng.paretovariate(1.2)) - 1)]
+    ending = pick(ENDINGS)
+    return f"{pick(SUBJECTS)} {pick(VERBS)} {pick(OBJECTS)}{' ' + ending if ending else ''}{rng.choice('.!?')}"
+
+def write_synthetic_srt(path, cue_count=1500, punctuated=True):
+    """
+    Write a film-like SRT with lots of repeated and short lines
+    punctuated=False drops sentence end punctuation, as many subtitles do
+    """
+    rng = random.Random(0)
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(cue_count):
+            start = i * 3000
+            line = synthetic_line(rng)
+            if not punctuated:
+                line = line.rstrip('.!?').replace('! ', ' ').replace('. ', ' ').replace('? ', ' ')
+            f.write(f"{i + 1}\n{format_time(start)} --> {format_time(start + 2500)}\n")
+            f.write(f"{line}\n\n")
+
+def format_time(ms):
+    hours, ms = divmod(ms, 3600000)
+    minutes, ms = divmod(ms, 60000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
+
+def report(path, language='english'):
+    """Print tokens for raw lines, line filtering and sentence compaction"""
+    lines = SRTProcessor.clean_srt(path)
+    candidate_filter = CandidateFilter(get_common_words(language, 200), language)
+    filtered = candidate_filter.filter_lines(lines)
+    _, compaction = candidate_filter.compact(lines)
+    filtered_tokens = SRTProcessor.estimate_tokens(SRTProcessor.get_text_from_lines(filtered))
+    print(os.path.basename(path))
+    print(f"  all unique lines      {compaction.tokens_before:>8} tokens")
+    print(f"  candidate lines       {filtered_tokens:>8} tokens")
+    print(f"  compacted sentences   {compaction.tokens_after:>8} tokens")
+    print(f"  {compaction.summary()}")
+
+def check_unpunctuated(tmp_dir, language='english'):
+    """
+    Regression check: lines without end punctuation must still split into
+    sentences, be deduplicated and give chunks within EXTRACT_CHUNK_TOKENS
+    """
+    path = os.path.join(tmp_dir, 'unpunctuated_film.srt')
+    write_synthetic_srt(path, 3000, punctuated=False)
+    lines = SRTProcessor.clean_srt(path)
+    candidate_filter = CandidateFilter(get_common_words(language, 200), language)
+    kept, compaction = candidate_filter.compact(lines)
+    chunks = SRTProcessor.chunk_lines(kept, EXTRACT_CHUNK_TOKENS)
+    largest = max((SRTProcessor.estimate_tokens(chunk) for chunk in chunks), default=0)
+    ok = compaction.kept_sentences > 1 and largest <= EXTRACT_CHUNK_TOKENS
+    print("Unpunctuated subtitles")
+    print(f"  {compaction.summary()}")
+    print(f"  {len(chunks)} chunks, largest {largest} tokens (limit {EXTRACT_CHUNK_TOKENS}): {'OK' if ok else 'FAILED'}")
+    return ok
+
+def main():
+    print("=" * 60)
+    print("Prompt Compaction Report")
+    print("=" * 60)
+    paths = sys.argv[1:]
+    if paths:
+        for path in paths:
+            report(path)
+        return
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'synthetic_film.srt')
+        write_synthetic_srt(path)
+        report(path)
+        ok = check_unpunctuated(tmp_dir)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Search Benchmark
+Times search_words on a synthetic library of a million word rows:
+the old LIKE '%query%' scan against the FTS5 trigram indexes
+
+Usage:
+    python bench_search.py [word rows]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from database.db_manager import DatabaseManager
+
+SRT_FILES = 2000
+VOCABULARY = 60000
+INSERT_BATCH = 10000
+REPEATS = 5
+
+MEANING_WORDS = ["نور", "دریا", "فانوس", "نگهبان", "خانه", "کتاب", "راه", "شب", "باران", "کوه"]
+EXAMPLE_WORDS = ["the", "keeper", "waved", "storm", "harbour", "map", "found", "village", "night", "ship"]
+
+# Query used before the full-text index
+LEGACY_QUERY = 'SELECT id, word, meaning, srtfile FROM words WHERE word LIKE ? ORDER BY word'
+
+QUERIES = [
+    ("rare word", "word12345"),
+    ("word fragment", "rd4242"),
+    ("meaning", "فانوس"),
+    ("two terms", "storm harbour"),
+    ("very common", "the"),
+    ("short prefix", "wo"),
+]
+
+def synthetic_rows(rng, count):
+    for _ in range(count):
+        word = f"word{rng.randrange(VOCABULARY)}"
+        meaning = ' '.join(rng.sample(MEANING_WORDS, 2))
+        example = ' '.join(rng.choice(EXAMPLE_WORDS) for _ in range(6))
+        yield (word, f"{meaning} | Examples: {example.capitalize()}.", rng.randint(1, SRT_FILES))
+
+def build_library(db, row_count):
+    """Insert srtfiles and words through DatabaseManager, so the triggers fill the index"""
+    rng = random.Random(0)
+    for i in range(SRT_FILES):
+        db.add_srt_file(f"film_{i}.srt")
+    rows = synthetic_rows(rng, row_count)
+    for _ in range(0, row_count, INSERT_BATCH):
+        db.add_words_batch([row for _, row in zip(range(INSERT_BATCH), rows)])
+
+def best_ms(run):
+    """Fastest of REPEATS runs in ms, and the row count"""
+    best = None
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        rows = run()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(rows)
+
+def main():
+    """Build the library and time each query with LIKE and with the index"""
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print("=" * 60)
+    print("Search Benchmark (search_words)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(os.path.join(tmp_dir, 'bench.db'))
+        db.initialize_database()
+        started = time.perf_counter()
+        build_library(db, row_count)
+        print(f"Library: {row_count} word rows ({time.perf_counter() - started:.1f}s to build and index)")
+
+        conn = db.get_connection()
+        print(f"{'query':>14} {'LIKE ms':>10} {'rows':>8} {'FTS ms':>10} {'page':>6}")
+        for label, query in QUERIES:
+            like_ms, like_rows = best_ms(lambda: conn.execute(LEGACY_QUERY, (f'%{query}%',)).fetchall())
+            fts_ms, page_rows = best_ms(lambda: db.search_words(query)[0])
+            print(f"{label:>14} {like_ms:>10.1f} {like_rows:>8} {fts_ms:>10.1f} {page_rows:>6}")
+
+        after = None
+        for _ in range(10):
+            _, after = db.search_words("storm", after=after)
+        page_ms, _ = best_ms(lambda: db.search_words("storm", after=after)[0])
+        print(f"Page 11 of 'storm': {page_ms:.1f} ms")
+        file_ms, file_rows = best_ms(lambda: db.search_words("the", srtfile_id=1)[0])
+        print(f"'the' within one SRT file: {file_ms:.1f} ms ({file_rows} results)")
+        db.close()
+
+    print("LIKE only searched the word; FTS also searches meanings and examples")
+    print("=" * 60)
+
+if __name__ == '__main__':
+    main()
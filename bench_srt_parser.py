@@ -0,0 +1,82 @@
+"""
+SRT Parser Benchmark
+Shows that peak memory of the streaming parser stays flat as input grows,
+then checks encoding detection on Persian/Arabic and European samples
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+from processors.srt_processor import iter_srt_file
+from utils.encoding_detector import detect_encoding
+
+# (label, text, codec the file is written with, codec it should be detected as)
+ENCODING_SAMPLES = [
+    ("Persian cp1256", "سلام، حالت چطوره؟\nمن فردا به خانه برمي‌گردم.\n", 'cp1256', 'cp1256'),
+    ("Arabic cp1256", "مرحبا بالعالم، هذه ترجمة جديدة.\nأين أنت الآن؟\n", 'cp1256', 'cp1256'),
+    ("Persian utf-16-le", "سلام، حالت چطوره؟\nمن فردا به خانه برمی‌گردم.\n", 'utf-16-le', 'utf-16-le'),
+    ("Spanish cp1252", "¿Qué estás haciendo aquí, señor?\nMañana subiremos a la montaña.\n", 'cp1252', 'cp1252'),
+    ("Swedish cp1252", "Året är över och vi åker hem.\nDet är så många år sedan.\n", 'cp1252', 'cp1252'),
+    ("German cp1252", "Über die Brücke müssen wir gehen.\nDie Straße ist schön und grün.\n", 'cp1252', 'cp1252'),
+]
+
+def write_synthetic_srt(path, cue_count):
+    """Write a synthetic SRT file with the given number of cues"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(cue_count):
+            start = i * 2000
+            end = start + 1500
+            f.write(f"{i + 1}\n")
+            f.write(f"{format_time(start)} --> {format_time(end)}\n")
+            f.write(f"<i>Line number {i} of the synthetic subtitle</i>\n")
+            f.write(f"Second line with word{i % 5000}\n\n")
+
+def format_time(ms):
+    """Format milliseconds as SRT timestamp"""
+    hours, ms = divmod(ms, 3600000)
+    minutes, ms = divmod(ms, 60000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
+
+def measure(path):
+    """Stream all cues and return (cue count, seconds, peak bytes)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = 0
+    for _ in iter_srt_file(path):
+        count += 1
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+def check_encodings():
+    """Detect the encoding of subtitle samples in several languages and codecs"""
+    print(f"{'sample':>20} {'expected':>10} {'detected':>10}")
+    for label, text, codec, expected in ENCODING_SAMPLES:
+        detected = detect_encoding((text * 20).encode(codec))
+        mark = "" if detected == expected else "  MISMATCH"
+        print(f"{label:>20} {expected:>10} {detected:>10}{mark}")
+
+def main():
+    """Run the benchmark for increasing input sizes"""
+    print("=" * 60)
+    print("Streaming SRT Parser Benchmark")
+    print("=" * 60)
+    print(f"{'cues':>10} {'file MB':>10} {'seconds':>10} {'peak KB':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for cue_count in (10_000, 100_000, 500_000):
+            path = os.path.join(tmp_dir, f"bench_{cue_count}.srt")
+            write_synthetic_srt(path, cue_count)
+            size_mb = os.path.getsize(path) / (1024 * 1024)
+            count, elapsed, peak = measure(path)
+            print(f"{count:>10} {size_mb:>10.1f} {elapsed:>10.2f} {peak / 1024:>10.1f}")
+
+    print("-" * 60)
+    check_encodings()
+    print("=" * 60)
+
+if __name__ == '__main__':
+    main()
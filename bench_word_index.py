@@ -0,0 +1,111 @@
+"""
+Word Index Benchmark
+Times get_words_by_srt on a synthetic library of a million word rows,
+before (no indexes, join on the raw word) and after the word_norm migration
+
+Usage:
+    python bench_word_index.py [word rows]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from database.db_manager import DatabaseManager
+
+SRT_FILES = 2000
+KNOWN_WORDS = 20000
+VOCABULARY = 60000
+QUERIES = 50
+
+# Query used before the migration
+LEGACY_QUERY = """
+    SELECT w.id, w.word, w.meaning, w.srtfile
+    FROM words w
+    WHERE w.srtfile = ?
+    AND NOT EXISTS (
+        SELECT 1
+        FROM known_words kw
+        WHERE kw.word = w.word
+    )
+    ORDER BY w.word
+"""
+
+def vocabulary_word(i):
+    """Synthetic word; every fourth one capitalized as at the start of a sentence"""
+    word = f"word{i}"
+    return word.capitalize() if i % 4 == 0 else word
+
+def write_legacy_library(path, row_count):
+    """Create a library with the schema and data of an old version (no word_norm, no indexes)"""
+    rng = random.Random(0)
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE srtfiles (id INTEGER NOT NULL UNIQUE, srtfile TEXT, PRIMARY KEY(id AUTOINCREMENT));
+        CREATE TABLE words (
+            id INTEGER NOT NULL UNIQUE, word TEXT, meaning TEXT, srtfile INTEGER,
+            PRIMARY KEY(id AUTOINCREMENT), FOREIGN KEY(srtfile) REFERENCES srtfiles(id)
+        );
+        CREATE TABLE known_words (id INTEGER NOT NULL UNIQUE, word TEXT UNIQUE, PRIMARY KEY(id AUTOINCREMENT));
+    ''')
+    conn.executemany('INSERT INTO srtfiles (srtfile) VALUES (?)',
+                     ((f"film_{i}.srt",) for i in range(SRT_FILES)))
+    conn.executemany(
+        'INSERT INTO words (word, meaning, srtfile) VALUES (?, ?, ?)',
+        ((vocabulary_word(rng.randrange(VOCABULARY)), "meaning | Examples: example", rng.randint(1, SRT_FILES))
+         for _ in range(row_count))
+    )
+    # Known words are stored lower-cased, as add_known_word() does
+    conn.executemany('INSERT INTO known_words (word) VALUES (?)',
+                     ((vocabulary_word(i).lower(),) for i in rng.sample(range(VOCABULARY), KNOWN_WORDS)))
+    conn.commit()
+    conn.close()
+
+def time_queries(run, srt_ids):
+    """Run the query for every SRT id; return (average ms, rows per query)"""
+    started = time.perf_counter()
+    rows = 0
+    for srt_id in srt_ids:
+        rows += len(run(srt_id))
+    elapsed = time.perf_counter() - started
+    return elapsed * 1000 / len(srt_ids), rows / len(srt_ids)
+
+def main():
+    """Build the library, time the old query, migrate and time the new one"""
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    srt_ids = random.Random(1).sample(range(1, SRT_FILES + 1), QUERIES)
+
+    print("=" * 60)
+    print("Word Index Benchmark (get_words_by_srt)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'bench.db')
+        started = time.perf_counter()
+        write_legacy_library(path, row_count)
+        print(f"Library: {row_count} word rows, {SRT_FILES} SRT files, {KNOWN_WORDS} known words "
+              f"({time.perf_counter() - started:.1f}s to build)")
+
+        conn = sqlite3.connect(path)
+        legacy_ms, legacy_rows = time_queries(lambda srt_id: conn.execute(LEGACY_QUERY, (srt_id,)).fetchall(), srt_ids)
+        conn.close()
+
+        db = DatabaseManager(path)
+        started = time.perf_counter()
+        db.initialize_database()
+        print(f"Migration (backfill word_norm + indexes): {time.perf_counter() - started:.1f}s")
+
+        indexed_ms, indexed_rows = time_queries(db.get_words_by_srt, srt_ids)
+        db.close()
+
+    print(f"{'':>12} {'ms/query':>10} {'rows/query':>12}")
+    print(f"{'before':>12} {legacy_ms:>10.2f} {legacy_rows:>12.1f}")
+    print(f"{'after':>12} {indexed_ms:>10.2f} {indexed_rows:>12.1f}")
+    print(f"Speedup: {legacy_ms / indexed_ms:.0f}x")
+    print("Capitalized words now match their lower-cased known entries, so 'after' returns fewer rows")
+    print("=" * 60)
+
+if __name__ == '__main__':
+    main()
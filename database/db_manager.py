@@ -1,32 +1,125 @@
 """
 Database Manager
 Handles all database operations with thread-safe connections
+
+With the 'performance' profile the database runs in WAL mode with tuned
+pragmas, and every write goes through one DatabaseWriter thread that
+group-commits; reads use thread-local connections and never wait for it.
 """
 
 import sqlite3
-from typing import List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
+import json
 import os
 import threading
+import time
+from database.known_words_buffer import KnownWordsBuffer
+from database.writer import DatabaseWriter
+from utils.word_normalizer import normalize_word
+
+# Max host parameters per IN (...) query
+SQL_BATCH_SIZE = 500
+
+# Stored in PRAGMA user_version; initialize_database() migrates older files
+SCHEMA_VERSION = 1
+
+# Results per page of search_words()
+SEARCH_PAGE_SIZE = 50
+
+# words.meaning is stored as "<meaning> | Examples: <examples>"; these SQL
+# expressions split it for the full-text index (alias: new, old or words)
+def _meaning_part(alias: str) -> str:
+    meaning = f"{alias}.meaning"
+    return (f"CASE WHEN instr({meaning}, ' | Examples: ') > 0 "
+            f"THEN substr({meaning}, 1, instr({meaning}, ' | Examples: ') - 1) ELSE {meaning} END")
+
+def _examples_part(alias: str) -> str:
+    meaning = f"{alias}.meaning"
+    return (f"CASE WHEN instr({meaning}, ' | Examples: ') > 0 "
+            f"THEN substr({meaning}, instr({meaning}, ' | Examples: ') + 13) ELSE '' END")
+
+# Filter on a words row (alias w) for _like_contains(term)
+_TEXT_CONTAINS = "w.word || ' ' || coalesce(w.meaning, '') LIKE ? ESCAPE '\\'"
+
+def _like_contains(term: str) -> str:
+    """LIKE pattern (used with ESCAPE '\\') matching text that contains term literally"""
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+def _fts_values(alias: str) -> str:
+    """rowid, word, meaning and examples of a words row, for words_fts"""
+    return f"{alias}.id, {alias}.word, {_meaning_part(alias)}, {_examples_part(alias)}"
+
+PROFILE_DEFAULT = 'default'
+PROFILE_PERFORMANCE = 'performance'
+
+# Pragmas applied to every connection of the performance profile
+# busy_timeout comes first, so switching to WAL waits for other connections
+PERFORMANCE_PRAGMAS = (
+    ('busy_timeout', 5000),
+    ('journal_mode', 'WAL'),  # Readers and the writer do not block each other
+    ('synchronous', 'NORMAL'),  # fsync at checkpoints, not at every commit (safe in WAL)
+    ('cache_size', -32000),  # 32 MB page cache per connection
+    ('mmap_size', 256 * 1024 * 1024),
+    ('temp_store', 'MEMORY'),
+)
 
 class DatabaseManager:
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, profile: str = PROFILE_DEFAULT):
         self.db_path = db_path
+        self.profile = profile
         self._local = threading.local()
         self._connections = []  # Track all connections
         self._lock = threading.Lock()
+        self._writer: Optional[DatabaseWriter] = None  # Started by initialize_database()
+        self._known_words = KnownWordsBuffer(self._load_known_words, self._apply_known_words)
+        self.search_index_enabled = False  # Set by initialize_database() if FTS5 is available
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.create_function('normalize_word', 1, normalize_word, deterministic=True)
+        if self.profile == PROFILE_PERFORMANCE:
+            for name, value in PERFORMANCE_PRAGMAS:
+                conn.execute(f'PRAGMA {name} = {value}')
+        return conn
         
     def get_connection(self):
         """Get thread-local database connection"""
         if not hasattr(self._local, 'connection') or self._local.connection is None:
-            self._local.connection = sqlite3.connect(self.db_path, check_same_thread=False)
-            self._local.connection.row_factory = sqlite3.Row
+            self._local.connection = self._connect()
             # Track connection with thread safety
             with self._lock:
                 self._connections.append(self._local.connection)
         return self._local.connection
     
+    def _write(self, operation):
+        """
+        Run operation(cursor) as one committed write and return its result
+        With the performance profile (once the database is initialized) it
+        runs on the writer thread, grouped with writes from other threads
+        into a single commit
+        """
+        if self._writer is not None:
+            return self._writer.execute(operation)
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            result = operation(cursor)
+            conn.commit()
+            return result
+        except Exception:
+            conn.rollback()
+            raise
+    
     def close(self):
         """Close all database connections"""
+        # Commit buffered and queued writes first
+        self._known_words.close()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        
         # Close current thread's connection
         if hasattr(self._local, 'connection') and self._local.connection:
             try:
@@ -65,6 +158,7 @@ class DatabaseManager:
                 word TEXT,
                 meaning TEXT,
                 srtfile INTEGER,
+                word_norm TEXT,
                 PRIMARY KEY(id AUTOINCREMENT),
                 FOREIGN KEY(srtfile) REFERENCES srtfiles(id)
             )
@@ -75,20 +169,163 @@ class DatabaseManager:
             CREATE TABLE IF NOT EXISTS known_words (
                 id INTEGER NOT NULL UNIQUE,
                 word TEXT UNIQUE,
+                word_norm TEXT,
+                PRIMARY KEY(id AUTOINCREMENT)
+            )
+        ''')
+        
+        self._migrate(cursor)
+        
+        # Lookups and the words/known_words join go through the normalized word
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_words_srtfile_norm ON words(srtfile, word_norm)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_words_norm ON words(word_norm)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_known_words_norm ON known_words(word_norm)')
+        
+        self.search_index_enabled = self._create_search_index(cursor)
+        
+        # Translation cache table (shared across SRT files)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS translation_cache (
+                word_norm TEXT NOT NULL,
+                source_lang TEXT NOT NULL,
+                target_lang TEXT NOT NULL,
+                meaning TEXT,
+                examples TEXT,
+                model TEXT,
+                fetched_at REAL,
+                PRIMARY KEY(word_norm, source_lang, target_lang)
+            )
+        ''')
+        
+        # Background jobs (extraction, meaning fetches) and their progress,
+        # so unfinished work resumes after a restart
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER NOT NULL UNIQUE,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                srtfile INTEGER,
+                payload TEXT,
+                error TEXT,
+                created_at REAL,
+                updated_at REAL,
                 PRIMARY KEY(id AUTOINCREMENT)
             )
         ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS job_checkpoints (
+                id INTEGER NOT NULL UNIQUE,
+                job_id INTEGER NOT NULL,
+                data TEXT,
+                PRIMARY KEY(id AUTOINCREMENT),
+                FOREIGN KEY(job_id) REFERENCES jobs(id)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_job_checkpoints_job ON job_checkpoints(job_id)')
         
         conn.commit()
+        
+        # The writer connects only now, so it never competes with the schema
+        # changes above for the write lock
+        if self.profile == PROFILE_PERFORMANCE and self._writer is None:
+            self._writer = DatabaseWriter(self._connect)
+    
+    def _create_search_index(self, cursor) -> bool:
+        """
+        Full-text indexes over every words row
+        words_fts is an FTS5 trigram table (case-insensitive substring matching)
+        over word, meaning and examples, whose content is read from the
+        words_search_source view, so no text is stored twice; words_word_fts
+        indexes only the word column, so word matches are found without walking
+        the long example doclists. Triggers keep both in sync with words
+        Returns False if this SQLite build has no FTS5 trigram tokenizer
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'words_fts'")
+        if not cursor.fetchone():
+            try:
+                cursor.execute(f'''
+                    CREATE VIEW IF NOT EXISTS words_search_source AS
+                    SELECT id, word, {_meaning_part('words')} AS meaning, {_examples_part('words')} AS examples
+                    FROM words
+                ''')
+                cursor.execute('''
+                    CREATE VIRTUAL TABLE words_fts USING fts5(
+                        word, meaning, examples,
+                        content='words_search_source', content_rowid='id',
+                        tokenize='trigram'
+                    )
+                ''')
+            except sqlite3.OperationalError as e:
+                print(f"Full-text search not available ({e}); using LIKE search")
+                cursor.execute('DROP VIEW IF EXISTS words_search_source')
+                return False
+            
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS words_fts_insert AFTER INSERT ON words BEGIN
+                    INSERT INTO words_fts (rowid, word, meaning, examples) VALUES ({_fts_values('new')});
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS words_fts_delete AFTER DELETE ON words BEGIN
+                    INSERT INTO words_fts (words_fts, rowid, word, meaning, examples) VALUES ('delete', {_fts_values('old')});
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS words_fts_update AFTER UPDATE OF word, meaning ON words BEGIN
+                    INSERT INTO words_fts (words_fts, rowid, word, meaning, examples) VALUES ('delete', {_fts_values('old')});
+                    INSERT INTO words_fts (rowid, word, meaning, examples) VALUES ({_fts_values('new')});
+                END
+            ''')
+            # Index the words stored before the index existed
+            cursor.execute("INSERT INTO words_fts (words_fts) VALUES ('rebuild')")
+        
+        # Added after words_fts, so databases indexed before it get it here
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'words_word_fts'")
+        if not cursor.fetchone():
+            cursor.execute('''
+                CREATE VIRTUAL TABLE words_word_fts USING fts5(
+                    word, content='words', content_rowid='id', tokenize='trigram'
+                )
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS words_word_fts_insert AFTER INSERT ON words BEGIN
+                    INSERT INTO words_word_fts (rowid, word) VALUES (new.id, new.word);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS words_word_fts_delete AFTER DELETE ON words BEGIN
+                    INSERT INTO words_word_fts (words_word_fts, rowid, word) VALUES ('delete', old.id, old.word);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS words_word_fts_update AFTER UPDATE OF word ON words BEGIN
+                    INSERT INTO words_word_fts (words_word_fts, rowid, word) VALUES ('delete', old.id, old.word);
+                    INSERT INTO words_word_fts (rowid, word) VALUES (new.id, new.word);
+                END
+            ''')
+            cursor.execute("INSERT INTO words_word_fts (words_word_fts) VALUES ('rebuild')")
+        return True
+    
+    def _migrate(self, cursor):
+        """Bring tables created by older versions up to SCHEMA_VERSION"""
+        version = cursor.execute('PRAGMA user_version').fetchone()[0]
+        if version < 1:
+            # Normalized word column, backfilled with the same normalize_word() used on insert
+            for table in ('words', 'known_words'):
+                columns = {row[1] for row in cursor.execute(f'PRAGMA table_info({table})')}
+                if 'word_norm' not in columns:
+                    cursor.execute(f'ALTER TABLE {table} ADD COLUMN word_norm TEXT')
+                cursor.execute(f'UPDATE {table} SET word_norm = normalize_word(word) WHERE word_norm IS NULL')
+        cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
     
     # SRT Files operations
     def add_srt_file(self, filename: str) -> int:
         """Add a new SRT file to database"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('INSERT INTO srtfiles (srtfile) VALUES (?)', (filename,))
-        conn.commit()
-        return cursor.lastrowid
+        def operation(cursor):
+            cursor.execute('INSERT INTO srtfiles (srtfile) VALUES (?)', (filename,))
+            return cursor.lastrowid
+        return self._write(operation)
     
     def get_all_srt_files(self) -> List[Tuple[int, str]]:
         """Get all SRT files"""
@@ -104,45 +341,63 @@ class DatabaseManager:
         cursor.execute('SELECT id, srtfile FROM srtfiles WHERE id = ?', (srt_id,))
         return cursor.fetchone()
     
+    def delete_srt_file(self, srt_id: int):
+        """Delete an SRT file and all its words"""
+        def operation(cursor):
+            cursor.execute('DELETE FROM words WHERE srtfile = ?', (srt_id,))
+            cursor.execute('DELETE FROM srtfiles WHERE id = ?', (srt_id,))
+        self._write(operation)
+    
     # Words operations
     def add_word(self, word: str, meaning: str, srtfile_id: int) -> int:
         """Add a new word with meaning"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            'INSERT INTO words (word, meaning, srtfile) VALUES (?, ?, ?)',
-            (word, meaning, srtfile_id)
-        )
-        conn.commit()
-        return cursor.lastrowid
+        def operation(cursor):
+            cursor.execute(
+                'INSERT INTO words (word, meaning, srtfile, word_norm) VALUES (?, ?, ?, ?)',
+                (word, meaning, srtfile_id, normalize_word(word))
+            )
+            return cursor.lastrowid
+        return self._write(operation)
     
     def add_words_batch(self, words_data: List[Tuple[str, str, int]]):
         """Add multiple words at once"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.executemany(
-            'INSERT INTO words (word, meaning, srtfile) VALUES (?, ?, ?)',
+        self._write(lambda cursor: cursor.executemany(
+            'INSERT INTO words (word, meaning, srtfile, word_norm) VALUES (?1, ?2, ?3, normalize_word(?1))',
             words_data
-        )
-        conn.commit()
+        ))
+    
+    def _known_condition(self, norm_sql: str) -> Tuple[str, list]:
+        """
+        SQL condition (and its parameters) that is true if the normalized
+        word norm_sql is known, counting changes still in the write-behind
+        buffer, so reads never wait for a flush
+        """
+        added, removed = self._known_words.pending_changes()
+        sql = f'EXISTS (SELECT 1 FROM known_words kw WHERE kw.word_norm = {norm_sql}'
+        params = []
+        if removed:
+            sql += ' AND kw.word NOT IN (SELECT value FROM json_each(?))'
+            params.append(json.dumps(removed))
+        sql += ')'
+        if added:
+            sql = f'({sql} OR {norm_sql} IN (SELECT value FROM json_each(?)))'
+            params.append(json.dumps(sorted({normalize_word(word) for word in added})))
+        return sql, params
     
     def get_words_by_srt(self, srtfile_id: int) -> List[dict]:
         """Get all unknown words for a specific SRT file"""
+        known, known_params = self._known_condition('w.word_norm')
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute(
-            """
+            f"""
             SELECT w.id, w.word, w.meaning, w.srtfile
             FROM words w
             WHERE w.srtfile = ?
-            AND NOT EXISTS (
-                SELECT 1
-                FROM known_words kw
-                WHERE kw.word = w.word
-            )
-            ORDER BY w.word
+            AND NOT {known}
+            ORDER BY w.word_norm
             """,
-            (srtfile_id,)
+            [srtfile_id] + known_params
         )
         rows = cursor.fetchall()
         return [dict(row) for row in rows]
@@ -156,46 +411,328 @@ class DatabaseManager:
         rows = cursor.fetchall()
         return [dict(row) for row in rows]
     
-    def search_words(self, query: str) -> List[dict]:
-        """Search words by partial match"""
+    def search_words(self, query: str, limit: int = SEARCH_PAGE_SIZE, after: Optional[tuple] = None,
+                     srtfile_id: Optional[int] = None,
+                     unknown_only: bool = False) -> Tuple[List[dict], Optional[tuple]]:
+        """
+        Search words, meanings and examples, best matches first
+        Terms match anywhere in the word, meaning or examples (case-insensitive).
+        Results come in tiers: words equal to or starting with the query, then
+        words containing the first term, then the other matches
+        Library-wide searches read each tier in index order (word_norm, then the
+        full-text indexes by rowid), so no query sorts every match; the indexes
+        need 3+ characters, so shorter terms next to longer ones filter their matches.
+        Searches within one SRT file scan only that file's rows
+        A query with only terms shorter than 3 characters matches the start of the word
+        Returns one page of results and the cursor to pass as after for the next
+        page (None when there are no more)
+        """
+        all_terms = query.split()
+        terms = [term for term in all_terms if len(term) >= 3]
+        short_terms = [term for term in all_terms if len(term) < 3]
+        prefix = normalize_word(query)
+        if not prefix:
+            return [], None
+        prefix_range = [prefix, prefix + '\U0010ffff']
+        filters = []
+        params = []
+        if terms and short_terms:
+            filters.extend(_TEXT_CONTAINS for _ in short_terms)
+            params.extend(_like_contains(term) for term in short_terms)
+        if srtfile_id is not None:
+            filters.append('w.srtfile = ?')
+            params.append(srtfile_id)
+        if unknown_only:
+            known, known_params = self._known_condition('w.word_norm')
+            filters.append(f'NOT {known}')
+            params.extend(known_params)
+        extra_filters = ''.join(' AND ' + f for f in filters)
+        
+        # Words equal to or starting with the query, over the word_norm index
+        # (a range instead of LIKE 'prefix%')
+        term_filters = ''.join(' AND ' + _TEXT_CONTAINS for _ in terms)
+        term_params = [_like_contains(term) for term in terms]
+        prefix_tier = (f'''
+            SELECT w.id, w.word, w.meaning, w.srtfile, w.word_norm
+            FROM words w
+            WHERE w.word_norm >= ? AND w.word_norm < ? {term_filters} {extra_filters}
+              AND (w.word_norm, w.id) > (?, ?)
+            ORDER BY w.word_norm, w.id
+            LIMIT ?
+        ''', prefix_range + term_params + params, 'word_norm')
+        
+        if not terms:
+            tiers = [prefix_tier]
+        elif self.search_index_enabled and srtfile_id is None:
+            # Each term is a quoted phrase, so FTS5 operators in the query are ignored
+            first, *rest = ['"' + term.replace('"', '""') + '"' for term in terms]
+            # Words containing the first term come from the small word-only
+            # index; the other terms are checked on the rows it finds
+            word_tier = (f'''
+                SELECT w.id, w.word, w.meaning, w.srtfile, w.word_norm
+                FROM words_word_fts
+                JOIN words w ON w.id = words_word_fts.rowid
+                WHERE words_word_fts MATCH ? AND NOT (w.word_norm >= ? AND w.word_norm < ?)
+                  {''.join(' AND ' + _TEXT_CONTAINS for _ in rest)} {extra_filters}
+                  AND words_word_fts.rowid > ?
+                ORDER BY words_word_fts.rowid
+                LIMIT ?
+            ''', [first] + prefix_range + term_params[1:] + params, 'rowid')
+            # Then every other match of all terms, in the meaning or examples
+            other_tier = (f'''
+                SELECT w.id, w.word, w.meaning, w.srtfile, w.word_norm
+                FROM words_fts
+                JOIN words w ON w.id = words_fts.rowid
+                WHERE words_fts MATCH ? AND NOT (w.word_norm >= ? AND w.word_norm < ?)
+                  AND w.id NOT IN (SELECT rowid FROM words_word_fts WHERE words_word_fts MATCH ?)
+                  {extra_filters}
+                  AND words_fts.rowid > ?
+                ORDER BY words_fts.rowid
+                LIMIT ?
+            ''', [' AND '.join([first] + rest)] + prefix_range + [first] + params, 'rowid')
+            tiers = [prefix_tier, word_tier, other_tier]
+        else:
+            # One file has few rows: scan them through the srtfile index and
+            # sort them by tier
+            like_filters = ' AND '.join(_TEXT_CONTAINS for _ in terms)
+            first = terms[0].lower()
+            tiers = [(f'''
+                SELECT id, word, meaning, srtfile, word_norm, tier FROM (
+                    SELECT w.id, w.word, w.meaning, w.srtfile, w.word_norm,
+                           CASE WHEN w.word_norm >= ? AND w.word_norm < ? THEN 0
+                                WHEN instr(w.word_norm, ?) > 0 THEN 1
+                                ELSE 2 END AS tier
+                    FROM words w
+                    WHERE {like_filters} {extra_filters}
+                )
+                WHERE (tier, word_norm, id) > (?, ?, ?)
+                ORDER BY tier, word_norm, id
+                LIMIT ?
+            ''', prefix_range + [first] + term_params + params, 'tier')]
+        
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute(
-            'SELECT id, word, meaning, srtfile FROM words WHERE word LIKE ? ORDER BY word',
-            (f'%{query}%',)
-        )
-        rows = cursor.fetchall()
-        return [dict(row) for row in rows]
+        # The cursor is (tier, word_norm, id) of the last row returned
+        start_tier, last_norm, last_id = after or (0, '', 0)
+        results = []
+        for tier, (sql, tier_params, order) in enumerate(tiers):
+            if order == 'tier':
+                # A single query returns every tier
+                key = [start_tier, last_norm, last_id]
+            elif tier < start_tier or len(results) == limit:
+                continue
+            elif order == 'word_norm':
+                key = [last_norm, last_id] if tier == start_tier else ['', 0]
+            else:
+                key = [last_id] if tier == start_tier else [0]
+            cursor.execute(sql, tier_params + key + [limit - len(results)])
+            for row in cursor.fetchall():
+                result = dict(row)
+                result.setdefault('tier', tier)
+                results.append(result)
+        if len(results) < limit:
+            next_after = None
+        else:
+            last = results[-1]
+            next_after = (last['tier'], last['word_norm'], last['id'])
+        for result in results:
+            del result['tier'], result['word_norm']
+        return results, next_after
     
     # Known words operations
+    # Changes go to the write-behind buffer and are written within
+    # KNOWN_WORDS_FLUSH_DELAY; SQL reads of known_words apply the changes
+    # not written yet (see _known_condition) instead of flushing
     def add_known_word(self, word: str) -> bool:
         """Add a word to known words list"""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute('INSERT INTO known_words (word) VALUES (?)', (word.lower(),))
-            conn.commit()
-            return True
-        except sqlite3.IntegrityError:
-            return False  # Word already exists
+        return self._known_words.add(word.lower())  # False if the word already exists
     
     def remove_known_word(self, word: str):
         """Remove a word from known words list"""
+        self._known_words.remove(word.lower())
+    
+    def flush_known_words(self):
+        """Write buffered known-word changes now"""
+        self._known_words.flush()
+    
+    def _load_known_words(self) -> List[str]:
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute('DELETE FROM known_words WHERE word = ?', (word.lower(),))
-        conn.commit()
+        cursor.execute('SELECT word FROM known_words')
+        return [row[0] for row in cursor.fetchall()]
+    
+    def _apply_known_words(self, added: List[str], removed: List[str]):
+        def operation(cursor):
+            cursor.executemany(
+                'INSERT OR IGNORE INTO known_words (word, word_norm) VALUES (?1, normalize_word(?1))',
+                [(word,) for word in added]
+            )
+            cursor.executemany('DELETE FROM known_words WHERE word = ?', [(word,) for word in removed])
+        self._write(operation)
     
     def get_all_known_words(self) -> List[str]:
         """Get all known words"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT word FROM known_words ORDER BY word')
-        return [row[0] for row in cursor.fetchall()]
+        return self._known_words.words()
     
     def is_word_known(self, word: str) -> bool:
         """Check if a word is in known words list"""
+        known, known_params = self._known_condition('w.word_norm')
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute('SELECT COUNT(*) FROM known_words WHERE word = ?', (word.lower(),))
-        return cursor.fetchone()[0] > 0
\ No newline at end of file
+        cursor.execute(f'SELECT {known} FROM (SELECT ? AS word_norm) w', known_params + [normalize_word(word)])
+        return bool(cursor.fetchone()[0])
+    
+    # Translation cache operations
+    def get_cached_meanings(self, words: List[str], source_lang: str, target_lang: str) -> Dict[str, dict]:
+        """
+        Look up cached meanings for words
+        Returns dict keyed by the given word spelling: {word: {'meaning': ..., 'examples': ...}}
+        """
+        by_norm = {}
+        for word in words:
+            by_norm.setdefault(normalize_word(word), []).append(word)
+        norms = [n for n in by_norm if n]
+        source_lang, target_lang = source_lang.strip().lower(), target_lang.strip().lower()
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        result = {}
+        for i in range(0, len(norms), SQL_BATCH_SIZE):
+            chunk = norms[i:i + SQL_BATCH_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(
+                f'''
+                SELECT word_norm, meaning, examples FROM translation_cache
+                WHERE source_lang = ? AND target_lang = ? AND word_norm IN ({placeholders})
+                ''',
+                [source_lang, target_lang] + chunk
+            )
+            for row in cursor.fetchall():
+                for word in by_norm[row['word_norm']]:
+                    result[word] = {'meaning': row['meaning'], 'examples': row['examples'] or ''}
+        return result
+    
+    def cache_meanings(self, meanings: Dict[str, dict], source_lang: str, target_lang: str, model: str):
+        """Store fetched meanings in the translation cache"""
+        now = time.time()
+        source_lang, target_lang = source_lang.strip().lower(), target_lang.strip().lower()
+        rows = [
+            (normalize_word(word), source_lang, target_lang,
+             entry.get('meaning', ''), entry.get('examples', ''), model, now)
+            for word, entry in meanings.items()
+            if normalize_word(word)
+        ]
+        if not rows:
+            return
+        self._write(lambda cursor: cursor.executemany(
+            '''
+            INSERT OR REPLACE INTO translation_cache
+                (word_norm, source_lang, target_lang, meaning, examples, model, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''',
+            rows
+        ))
+
+    # Job operations
+    @staticmethod
+    def _job_from_row(row) -> dict:
+        job = dict(row)
+        job['payload'] = json.loads(job['payload']) if job['payload'] else {}
+        return job
+    
+    def create_job(self, kind: str, payload: dict, srtfile_id: Optional[int] = None,
+                   status: str = 'pending') -> int:
+        """Add a new background job and return its ID"""
+        now = time.time()
+        
+        def operation(cursor):
+            cursor.execute(
+                '''
+                INSERT INTO jobs (kind, status, srtfile, payload, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ''',
+                (kind, status, srtfile_id, json.dumps(payload), now, now)
+            )
+            return cursor.lastrowid
+        return self._write(operation)
+    
+    def get_job(self, job_id: int) -> Optional[dict]:
+        """Get a job with its payload decoded"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM jobs WHERE id = ?', (job_id,))
+        row = cursor.fetchone()
+        return self._job_from_row(row) if row else None
+    
+    def get_jobs(self, statuses: Iterable[str], kind: Optional[str] = None) -> List[dict]:
+        """Get jobs in any of the given statuses, oldest first"""
+        statuses = list(statuses)
+        placeholders = ','.join('?' * len(statuses))
+        query = f'SELECT * FROM jobs WHERE status IN ({placeholders})'
+        params = statuses
+        if kind is not None:
+            query += ' AND kind = ?'
+            params = statuses + [kind]
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(query + ' ORDER BY id', params)
+        return [self._job_from_row(row) for row in cursor.fetchall()]
+    
+    def update_job(self, job_id: int, status: Optional[str] = None, payload: Optional[dict] = None,
+                   srtfile_id: Optional[int] = None, error: Optional[str] = None):
+        """Update the given fields of a job"""
+        fields = {'updated_at': time.time()}
+        if status is not None:
+            fields['status'] = status
+        if payload is not None:
+            fields['payload'] = json.dumps(payload)
+        if srtfile_id is not None:
+            fields['srtfile'] = srtfile_id
+        if error is not None:
+            fields['error'] = error
+        assignments = ', '.join(f'{name} = ?' for name in fields)
+        self._write(lambda cursor: cursor.execute(
+            f'UPDATE jobs SET {assignments} WHERE id = ?', list(fields.values()) + [job_id]
+        ))
+    
+    def add_job_checkpoint(self, job_id: int, data):
+        """Record one completed step of a job"""
+        self._write_with_checkpoint(job_id, data, None, ())
+    
+    def get_job_checkpoints(self, job_id: int) -> list:
+        """Get the recorded steps of a job in the order they completed"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT data FROM job_checkpoints WHERE job_id = ? ORDER BY id', (job_id,))
+        return [json.loads(row[0]) for row in cursor.fetchall()]
+    
+    def delete_job_checkpoints(self, job_id: int):
+        """Drop the checkpoints of a job that no longer needs them"""
+        self._write(lambda cursor: cursor.execute('DELETE FROM job_checkpoints WHERE job_id = ?', (job_id,)))
+    
+    def save_job_words(self, job_id: int, words_data: List[Tuple[str, str, int]], checkpoint):
+        """Add words and the job checkpoint covering them in one transaction"""
+        self._write_with_checkpoint(
+            job_id, checkpoint,
+            'INSERT INTO words (word, meaning, srtfile, word_norm) VALUES (?1, ?2, ?3, normalize_word(?1))',
+            words_data
+        )
+    
+    def update_job_meanings(self, job_id: int, updates: List[Tuple[str, str, int]], checkpoint):
+        """Update (meaning, word, srtfile) rows and the job checkpoint covering them in one transaction"""
+        self._write_with_checkpoint(
+            job_id, checkpoint,
+            'UPDATE words SET meaning = ?1 WHERE srtfile = ?3 AND word_norm = normalize_word(?2) AND word = ?2',
+            updates
+        )
+    
+    def _write_with_checkpoint(self, job_id: int, checkpoint, sql: Optional[str], rows):
+        def operation(cursor):
+            if sql and rows:
+                cursor.executemany(sql, rows)
+            cursor.execute(
+                'INSERT INTO job_checkpoints (job_id, data) VALUES (?, ?)',
+                (job_id, json.dumps(checkpoint))
+            )
+            cursor.execute('UPDATE jobs SET updated_at = ? WHERE id = ?', (time.time(), job_id))
+        self._write(operation)
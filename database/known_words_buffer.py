@@ -0,0 +1,140 @@
+"""
+Known Words Buffer
+Write-behind buffer for known words
+
+Marking a word known (or not) updates an in-memory set at once, so triage
+in the word screens never waits for SQLite. Changes are written in one
+transaction shortly afterwards, or when flush() is called (e.g. on app stop).
+Delayed writes all run on one long-lived flusher thread, so they reuse a
+single thread-local connection.
+"""
+
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+KNOWN_WORDS_FLUSH_DELAY = 0.5  # Seconds changes wait to be written together
+
+class KnownWordsBuffer:
+    def __init__(self, load: Callable[[], Iterable[str]],
+                 apply: Callable[[List[str], List[str]], None],
+                 delay: float = KNOWN_WORDS_FLUSH_DELAY):
+        """
+        load() returns the stored known words; apply(added, removed) writes
+        a set of changes in one transaction
+        """
+        self.delay = delay
+        self._load = load
+        self._apply = apply
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._words: Optional[Set[str]] = None  # Loaded on first use
+        self._pending: Dict[str, bool] = {}  # Word -> known; the last change wins
+        self._writing: Dict[str, bool] = {}  # Changes of the flush in progress
+        self._wake = threading.Event()  # Set when there are changes to write
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _known(self) -> Set[str]:
+        if self._words is None:
+            self._words = set(self._load())
+        return self._words
+
+    def add(self, word: str) -> bool:
+        """Mark a (lower-cased) word known; False if it already was"""
+        with self._lock:
+            known = self._known()
+            if word in known:
+                return False
+            known.add(word)
+            self._change(word, True)
+            return True
+
+    def remove(self, word: str):
+        with self._lock:
+            known = self._known()
+            if word in known:
+                known.discard(word)
+                self._change(word, False)
+
+    def contains(self, word: str) -> bool:
+        with self._lock:
+            return word in self._known()
+
+    def words(self) -> List[str]:
+        """All known words, sorted"""
+        with self._lock:
+            return sorted(self._known())
+
+    def has_pending(self) -> bool:
+        with self._lock:
+            return bool(self._pending)
+
+    def pending_changes(self) -> Tuple[List[str], List[str]]:
+        """
+        (added, removed) words not committed yet, including a flush in progress
+        Lets readers apply them to SQL results instead of flushing first
+        """
+        with self._lock:
+            changes = dict(self._writing)
+            changes.update(self._pending)
+        return (
+            [word for word, known in changes.items() if known],
+            [word for word, known in changes.items() if not known]
+        )
+
+    def _change(self, word: str, known: bool):
+        self._pending[word] = known
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._closed.is_set():
+            return  # Written by close() or the next flush()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="known-words-flusher", daemon=True)
+            self._thread.start()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            # Let changes made in quick succession collect before writing
+            if self._closed.wait(self.delay):
+                return
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Write every pending change now"""
+        # Flushes run one at a time so changes reach SQLite in order; the
+        # state lock is not held while writing, so add() never waits on disk
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._writing = pending
+            if not pending:
+                return
+            try:
+                self._apply(
+                    [word for word, known in pending.items() if known],
+                    [word for word, known in pending.items() if not known]
+                )
+            except Exception as e:
+                print(f"Error saving known words: {e}")
+                with self._lock:
+                    self._writing = {}
+                    # Keep the changes for the next flush unless they were superseded
+                    for word, known in pending.items():
+                        self._pending.setdefault(word, known)
+                    self._schedule_flush()
+                return
+            with self._lock:
+                self._writing = {}
+
+    def close(self):
+        """Stop the flusher thread and write every pending change"""
+        self._closed.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
@@ -0,0 +1,122 @@
+"""
+Database Writer
+Single thread that owns the only writing connection of the performance profile
+
+Write operations from any thread are queued; the writer runs everything
+waiting in the queue in one transaction and commits once (group commit).
+Each operation runs inside its own savepoint, so one failing write (e.g. a
+duplicate known word) is rolled back without affecting the others.
+"""
+
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple
+
+WRITER_MAX_BATCH = 256  # Operations per group commit
+
+# operation(cursor) performs the writes of one call and returns its result
+Operation = Callable[[sqlite3.Cursor], object]
+
+class DatabaseWriter:
+    def __init__(self, connect: Callable[[], sqlite3.Connection], max_batch: int = WRITER_MAX_BATCH):
+        """connect() opens the writer's connection (called on the writer thread)"""
+        self.max_batch = max_batch
+        self._connect = connect
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None  # Why the thread stopped, if it failed
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, operation: Operation) -> Future:
+        """Queue an operation; the future resolves after its transaction commits"""
+        future = Future()
+        if threading.current_thread() is self._thread:
+            # Called from inside another operation: run it in the same transaction
+            future.set_result(operation(self._cursor))
+            return future
+        with self._lock:
+            if self._error is not None:
+                raise sqlite3.OperationalError(f"Database writer is not running: {self._error}") from self._error
+            self._queue.put((operation, future))
+        return future
+
+    def execute(self, operation: Operation):
+        """Run an operation and wait for its commit; returns its result or raises its error"""
+        return self.submit(operation).result()
+
+    def close(self):
+        """Commit everything queued so far and stop the thread"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        try:
+            conn = self._connect()
+            conn.isolation_level = None  # Transactions are managed explicitly
+            self._cursor = conn.cursor()
+        except Exception as e:
+            print(f"Database writer could not connect: {e}")
+            self._fail(e)
+            return
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+        conn.close()
+
+    def _fail(self, error: BaseException):
+        """Fail every queued operation; later submits raise instead of waiting forever"""
+        with self._lock:
+            self._error = error
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                item[1].set_exception(error)
+
+    def _commit(self, batch: List[Tuple[Operation, Future]]):
+        cursor = self._cursor
+        outcomes: List[Tuple[Future, object, Optional[BaseException]]] = []
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            for operation, future in batch:
+                cursor.execute('SAVEPOINT operation')
+                try:
+                    result = operation(cursor)
+                except Exception as e:
+                    cursor.execute('ROLLBACK TO operation')
+                    outcomes.append((future, None, e))
+                else:
+                    outcomes.append((future, result, None))
+                cursor.execute('RELEASE operation')
+            cursor.execute('COMMIT')
+        except Exception as e:
+            # The transaction itself failed: nothing in this batch was written
+            if cursor.connection.in_transaction:
+                cursor.execute('ROLLBACK')
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
@@ -32,7 +32,9 @@ except Exception as e:
 # Now import Kivy/KivyMD
 from kivymd.app import MDApp
 from kivy.lang import Builder
+from kivy.clock import Clock
 from database.db_manager import DatabaseManager
+from services.jobs import create_job_queue
 
 # Import screens to register them
 print("Importing screens...")
@@ -100,6 +102,7 @@ class VocabApp(MDApp):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.db_manager = None
+        self.job_queue = None
         print("VocabApp initialized")
         
     def build(self):
@@ -111,21 +114,52 @@ class VocabApp(MDApp):
         print("  ✓ Theme set")
         
         # Initialize database
+        from utils.settings_manager import get_settings_manager
         db_path = os.path.join(os.path.dirname(__file__), 'vocab.db')
-        self.db_manager = DatabaseManager(db_path)
+        self.db_manager = DatabaseManager(db_path, get_settings_manager().get_database_profile())
         self.db_manager.initialize_database()
         print("  ✓ Database initialized")
         
+        # Durable job queue for extraction and meaning fetches
+        self.job_queue = create_job_queue(self.db_manager)
+        
         # Build and return the root widget
         print("  Loading KV...")
         root = Builder.load_string(KV)
         print("  ✓ KV loaded")
+        
+        # Screens follow the progress of the jobs they started
+        for screen in root.screens:
+            if hasattr(screen, 'on_job_event'):
+                self.job_queue.add_listener(screen.on_job_event)
         return root
     
+    def on_start(self):
+        """Open API connections in the background so the first job is fast"""
+        try:
+            from services.client_pool import start_warm_up
+            from services.gemini_service import GEMINI_MODEL
+            from utils.settings_manager import get_settings_manager
+            start_warm_up(get_settings_manager().get_api_keys(), GEMINI_MODEL)
+            print("  ✓ API client warm-up started")
+        except Exception as e:
+            print(f"  ⚠ API client warm-up skipped: {e}")
+        
+        # Resume jobs interrupted when the app last closed
+        self.job_queue.start()
+        resumed = self.job_queue.resume_unfinished()
+        if resumed:
+            print(f"  ✓ Resuming {len(resumed)} unfinished job(s)")
+        Clock.schedule_once(lambda dt: self.root.get_screen('home').restore_review(), 0)
+    
     def on_stop(self):
         """Called when application stops"""
         print("App stopping...")
+        if self.job_queue:
+            self.job_queue.stop()
         if self.db_manager:
+            # Known-word changes are written behind; save the last ones
+            self.db_manager.flush_known_words()
             self.db_manager.close()
         return True
 
@@ -0,0 +1,202 @@
+"""
+Candidate Filter
+Local tokenizer stage that runs before the Gemini prompt is built
+Drops known words, stop words and numerals so only lines with
+unknown candidate words are sent to the API, and compacts the remaining
+text to a few sentences per candidate word
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+from processors.srt_processor import SRTProcessor
+
+# Letters only (no digits), with inner apostrophes kept: "don't", "o'clock"
+WORD_PATTERN = re.compile(r"[^\W\d_]+(?:['\u2019][^\W\d_]+)*")
+
+ENGLISH_STOP_WORDS = frozenset('''
+a about above after again against ago ah all almost also am an and any are aren't
+as at be because been before being below between both but by can can't cannot
+could couldn't did didn't do does doesn't doing don't down during each either else
+even ever every few for from further get gets got had hadn't has hasn't have haven't
+having he he'd he'll he's hey her here here's hers herself hi him himself his how
+how's huh i i'd i'll i'm i've if in into is isn't it it's its itself just let let's
+like me mine more most much must mustn't my myself no nor not now of off oh ok okay
+on once one only or other ought our ours ourselves out over own really right same
+say said see shan't she she'd she'll she's should shouldn't so some still such than
+that that's the their theirs them themselves then there there's these they they'd
+they'll they're they've this those though through to too uh um under until up upon
+us very was wasn't we we'd we'll we're we've well were weren't what what's when
+when's where where's whether which while who who's whom why why's will with won't
+would wouldn't yeah yes yet you you'd you'll you're you've your yours yourself
+yourselves
+zero two three four five six seven eight nine ten eleven twelve thirteen fourteen
+fifteen sixteen seventeen eighteen nineteen twenty thirty forty fifty sixty seventy
+eighty ninety hundred thousand million first second third
+'''.split())
+
+# Sentence ends (the punctuation stays with the sentence)
+SENTENCE_END_PATTERN = re.compile(r'(?:(?<=[.!?\u2026])|(?<=[.!?\u2026]["\'\u201d)\]]))\s+')
+# Titles and abbreviations whose period does not end the sentence: "Mr. Smith"
+ABBREVIATION_END_PATTERN = re.compile(
+    r'\b(?:mr|mrs|ms|dr|prof|sr|jr|st|mt|lt|sgt|capt|col|gen|rev|vs)\.$', re.IGNORECASE
+)
+# A sentence without end punctuation is carried to the next cue line only if
+# it ends with one of these or the next line starts lower-case
+CONTINUATION_ENDS = (',', ';', ':')
+# Longest sentence carried over lines, so unpunctuated text still splits
+MAX_SENTENCE_CHARS = 300
+
+# Dialogue dash at the start of a subtitle line: "- Hi."
+DIALOGUE_DASH_PATTERN = re.compile(r'^\s*[-\u2013\u2014]+\s*')
+
+# Sentences kept per distinct candidate word when compacting the prompt
+MAX_SENTENCES_PER_WORD = 2
+
+STOP_WORDS = {
+    'english': ENGLISH_STOP_WORDS,
+}
+
+def get_stop_words(language: str) -> frozenset:
+    """Get stop words for a language name from settings (empty if unknown)"""
+    return STOP_WORDS.get((language or '').strip().lower(), frozenset())
+
+class CompactionReport(NamedTuple):
+    lines: int
+    sentences: int
+    kept_sentences: int
+    tokens_before: int
+    tokens_after: int
+    candidates_before: int
+    candidates_after: int
+
+    def summary(self) -> str:
+        ratio = self.tokens_before / max(1, self.tokens_after)
+        return (
+            f"Prompt compaction: {self.tokens_before} -> {self.tokens_after} tokens ({ratio:.1f}x), "
+            f"{self.sentences} -> {self.kept_sentences} sentences, "
+            f"{self.candidates_after}/{self.candidates_before} candidate words kept"
+        )
+
+def continues_on(carry: str, line: str) -> bool:
+    """Check if an unfinished sentence clearly continues on the next line"""
+    return (
+        carry.endswith(CONTINUATION_ENDS)
+        or line[0].islower()
+        or bool(ABBREVIATION_END_PATTERN.search(carry))
+    )
+
+def split_sentences(lines: Iterable[str]) -> List[str]:
+    """
+    Split subtitle lines into sentences
+    A sentence running over several lines is joined back together when the
+    line clearly continues it (see continues_on), and a period after a
+    title such as "Mr." does not end it; any other unpunctuated line ends
+    its sentence, as do sentences longer than MAX_SENTENCE_CHARS
+    """
+    sentences = []
+    carry = ''
+    for line in lines:
+        line = DIALOGUE_DASH_PATTERN.sub('', line).strip()
+        if not line:
+            continue
+        if carry and not continues_on(carry, line):
+            sentences.append(carry)
+            carry = ''
+        text = f"{carry} {line}" if carry else line
+        # The trailing space lets a sentence end at the end of the line match;
+        # the last part is then '' or an unfinished sentence carried on
+        parts = []
+        for part in SENTENCE_END_PATTERN.split(text + ' '):
+            if parts and ABBREVIATION_END_PATTERN.search(parts[-1]):
+                parts[-1] = f"{parts[-1]} {part}"
+            else:
+                parts.append(part)
+        carry = parts.pop().strip()
+        if len(carry) > MAX_SENTENCE_CHARS:
+            parts.append(carry)
+            carry = ''
+        sentences.extend(DIALOGUE_DASH_PATTERN.sub('', p) for p in parts if p)
+    if carry:
+        sentences.append(carry)
+    return sentences
+
+class CandidateFilter:
+    def __init__(self, known_words: Iterable[str], language: str = 'english', min_length: int = 2):
+        self.known_words = {w.lower() for w in known_words}
+        self.stop_words = get_stop_words(language)
+        self.min_length = min_length
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Split text into lower-cased word tokens (numerals are never tokens)"""
+        return [m.group(0).replace('\u2019', "'").lower() for m in WORD_PATTERN.finditer(text)]
+
+    def is_candidate(self, token: str) -> bool:
+        """Check if a lower-cased token may be an unknown word"""
+        return (
+            len(token) >= self.min_length
+            and token not in self.stop_words
+            and token not in self.known_words
+        )
+
+    def candidate_tokens(self, text: str) -> List[str]:
+        """Get candidate tokens of a text in order"""
+        return [t for t in self.tokenize(text) if self.is_candidate(t)]
+
+    def has_candidates(self, text: str) -> bool:
+        """Check if text contains at least one candidate token"""
+        return any(self.is_candidate(t) for t in self.tokenize(text))
+
+    def filter_lines(self, lines: Iterable[str]) -> List[str]:
+        """Keep only lines that still hold unknown candidate words"""
+        return [line for line in lines if self.has_candidates(line)]
+
+    def compact(self, lines: List[str],
+                max_sentences_per_word: int = MAX_SENTENCES_PER_WORD) -> Tuple[List[str], CompactionReport]:
+        """
+        Compact subtitle lines into the sentences worth sending to the API
+        - sentences are deduplicated after normalizing case and punctuation
+        - sentences without candidate tokens are dropped
+        - a sentence is only kept while one of its candidate words has
+          appeared in fewer than max_sentences_per_word kept sentences
+        Every candidate word should keep at least one sentence; the report
+        measures this by extracting candidates again from the kept sentences
+        Returns (sentences, report)
+        """
+        sentences = split_sentences(lines)
+        seen = set()
+        uses: Dict[str, int] = {}
+        kept = []
+
+        for sentence in sentences:
+            tokens = self.tokenize(sentence)
+            key = ' '.join(tokens)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            candidates = {t for t in tokens if self.is_candidate(t)}
+            if not candidates:
+                continue
+            # Count every candidate, including words already at the cap
+            for token in candidates:
+                uses.setdefault(token, 0)
+            if all(uses[token] >= max_sentences_per_word for token in candidates):
+                continue
+            for token in candidates:
+                uses[token] += 1
+            kept.append(sentence)
+
+        # Recall: candidates of the original lines still present after compaction
+        candidates_before = {t for line in lines for t in self.candidate_tokens(line)}
+        candidates_after = {t for sentence in kept for t in self.candidate_tokens(sentence)}
+
+        report = CompactionReport(
+            lines=len(lines),
+            sentences=len(sentences),
+            kept_sentences=len(kept),
+            tokens_before=SRTProcessor.estimate_tokens(SRTProcessor.get_text_from_lines(lines)),
+            tokens_after=SRTProcessor.estimate_tokens(SRTProcessor.get_text_from_lines(kept)),
+            candidates_before=len(candidates_before),
+            candidates_after=len(candidates_before & candidates_after),
+        )
+        return kept, report
@@ -0,0 +1,129 @@
+"""
+Cue Table
+Compact column store for parsed subtitle cues
+Keeps timings in int arrays and all cue text in one string buffer
+"""
+
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Sequence, Tuple
+from processors.srt_processor import SRTCue, iter_srt_file
+
+class CueTable:
+    def __init__(self):
+        self.starts = array('i')
+        self.ends = array('i')
+        self.offsets = array('q', [0])  # offsets[i]..offsets[i + 1] is cue i text
+        self._buffer = ''
+        self._pending: List[str] = []  # Text appended since the last compaction
+        self._sorted = True
+
+    @classmethod
+    def from_cues(cls, cues: Iterable[SRTCue]) -> 'CueTable':
+        """Build a table from a stream of cues"""
+        table = cls()
+        for cue in cues:
+            table.append(cue.start_ms, cue.end_ms, cue.text)
+        table.compact()
+        return table
+
+    @classmethod
+    def from_file(cls, file_path: str) -> 'CueTable':
+        """Build a table straight from an SRT file"""
+        return cls.from_cues(iter_srt_file(file_path))
+
+    def append(self, start_ms: int, end_ms: int, text: str):
+        """Append one cue"""
+        if self.starts and start_ms < self.starts[-1]:
+            self._sorted = False
+        self.starts.append(start_ms)
+        self.ends.append(end_ms)
+        self._pending.append(text)
+        self.offsets.append(self.offsets[-1] + len(text))
+
+    def compact(self):
+        """Merge pending text into the shared buffer"""
+        if self._pending:
+            self._buffer = ''.join([self._buffer] + self._pending)
+            self._pending = []
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def text(self, i: int) -> str:
+        """Get text of cue i"""
+        self.compact()
+        return self._buffer[self.offsets[i]:self.offsets[i + 1]]
+
+    def cue(self, i: int) -> Tuple[int, int, str]:
+        """Get (start_ms, end_ms, text) of cue i"""
+        return self.starts[i], self.ends[i], self.text(i)
+
+    def iter_texts(self, start: int = 0, stop: int = None) -> Iterable[str]:
+        """Iterate cue texts in index range"""
+        self.compact()
+        stop = len(self) if stop is None else stop
+        buffer, offsets = self._buffer, self.offsets
+        for i in range(start, stop):
+            yield buffer[offsets[i]:offsets[i + 1]]
+
+    # Time based queries
+
+    def slice_time(self, start_ms: int, end_ms: int) -> Sequence[int]:
+        """
+        Get indexes of cues starting in [start_ms, end_ms)
+        A range found by binary search when cues are in time order,
+        otherwise the list of matching indexes
+        """
+        if self._sorted:
+            return range(
+                bisect_left(self.starts, start_ms),
+                bisect_left(self.starts, end_ms)
+            )
+        return [i for i, s in enumerate(self.starts) if start_ms <= s < end_ms]
+
+    def cue_at(self, time_ms: int) -> int:
+        """Get index of the cue shown at time_ms, or -1"""
+        if self._sorted:
+            i = bisect_right(self.starts, time_ms) - 1
+            if i >= 0 and self.ends[i] >= time_ms:
+                return i
+            return -1
+        for i, (s, e) in enumerate(zip(self.starts, self.ends)):
+            if s <= time_ms <= e:
+                return i
+        return -1
+
+    def context(self, i: int, radius: int = 1) -> List[str]:
+        """Get texts of cue i and its neighbours"""
+        return list(self.iter_texts(max(0, i - radius), min(len(self), i + radius + 1)))
+
+    def find(self, word: str) -> List[int]:
+        """Get indexes of cues whose text contains word (case-insensitive)"""
+        if not word:
+            return []
+        self.compact()
+        # Match on the buffer itself: lower() would copy it, and can change
+        # the length of some characters (e.g. 'İ'), shifting the offsets
+        pattern = re.compile(re.escape(word), re.IGNORECASE)
+        result = []
+        match = pattern.search(self._buffer)
+        while match:
+            i = bisect_right(self.offsets, match.start()) - 1
+            if match.end() > self.offsets[i + 1]:
+                # Match spans two cues, not a real hit
+                match = pattern.search(self._buffer, match.start() + 1)
+                continue
+            result.append(i)
+            match = pattern.search(self._buffer, self.offsets[i + 1])
+        return result
+
+    def per_minute_density(self) -> array:
+        """Get number of cues starting in each minute"""
+        if not self.starts:
+            return array('i')
+        density = array('i', [0]) * (max(self.starts) // 60000 + 1)
+        for s in self.starts:
+            density[s // 60000] += 1
+        return density
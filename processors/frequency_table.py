@@ -0,0 +1,74 @@
+"""
+Frequency Table
+Bundled word-frequency rank lists used to skip trivially common words offline
+One file per srt_language in data/frequency/<language>.txt,
+one word per line, most frequent first
+"""
+
+import mmap
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+FREQUENCY_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'frequency')
+
+class FrequencyTable:
+    def __init__(self, path: str):
+        self.path = path
+
+    @classmethod
+    def for_language(cls, language: str) -> Optional['FrequencyTable']:
+        """Get the bundled table for a language name, or None if not shipped"""
+        name = (language or '').strip().lower()
+        path = os.path.join(FREQUENCY_DIR, f"{name}.txt")
+        if not name or not os.path.exists(path):
+            return None
+        return cls(path)
+
+    def top_words(self, top_n: int) -> frozenset:
+        """
+        Get the top_n most frequent words as a set for O(1) lookups
+        Only the first top_n lines of the file are read
+        """
+        if top_n <= 0 or os.path.getsize(self.path) == 0:
+            return frozenset()
+
+        words = set()
+        with open(self.path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                start = 0
+                while len(words) < top_n and start < len(mm):
+                    end = mm.find(b'\n', start)
+                    if end == -1:
+                        end = len(mm)
+                    word = mm[start:end].decode('utf-8', errors='ignore').strip().lower()
+                    if word:
+                        words.add(word)
+                    start = end + 1
+        return frozenset(words)
+
+# Cache of loaded sets keyed by (language, top_n)
+_common_words_cache: Dict[Tuple[str, int], frozenset] = {}
+_cache_lock = threading.Lock()
+
+def get_common_words(language: str, top_n: int) -> frozenset:
+    """
+    Get the top_n common words for a language (empty if none shipped)
+
+    Usage:
+        from processors.frequency_table import get_common_words
+
+        common = get_common_words(settings.get_srt_language(),
+                                  settings.get_common_words_threshold())
+    """
+    key = ((language or '').strip().lower(), top_n)
+    with _cache_lock:
+        if key in _common_words_cache:
+            return _common_words_cache[key]
+
+    table = FrequencyTable.for_language(language)
+    words = table.top_words(top_n) if table else frozenset()
+
+    with _cache_lock:
+        _common_words_cache[key] = words
+    return words
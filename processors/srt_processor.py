@@ -4,7 +4,105 @@ Handles SRT file processing and text extraction
 """
 
 import re
-from typing import List, Set
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Set, TextIO
+from utils.encoding_detector import open_text
+
+# Precompiled patterns shared by the streaming parser
+TIMING_PATTERN = re.compile(
+    r'^(\d+):(\d{2}):(\d{2})[,.](\d{1,3})\s*-->\s*(\d+):(\d{2}):(\d{2})[,.](\d{1,3})'
+)
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+
+class SRTCue(NamedTuple):
+    """A single subtitle cue (times in milliseconds)"""
+    index: int
+    start_ms: int
+    end_ms: int
+    text: str
+
+
+def _timing_to_ms(hours: str, minutes: str, seconds: str, millis: str) -> int:
+    """Convert matched timing groups to milliseconds"""
+    return (
+        int(hours) * 3600000
+        + int(minutes) * 60000
+        + int(seconds) * 1000
+        + int(millis.ljust(3, '0'))
+    )
+
+
+def iter_srt_cues(stream: TextIO) -> Iterator[SRTCue]:
+    """
+    Parse an SRT stream and yield cues one at a time
+    Reads the stream line by line so memory stays flat for large files
+    Text lines are stripped of HTML tags and joined with newlines
+    """
+    index = 0
+    start_ms = end_ms = 0
+    text_lines: List[str] = []
+    in_cue = False
+    pending_index = None  # Digit-only line that may start the next cue
+
+    for raw_line in stream:
+        line = raw_line.strip().lstrip('\ufeff')
+
+        timing = TIMING_PATTERN.match(line)
+        if timing:
+            # Flush the previous cue if the blank separator was missing
+            if in_cue and text_lines:
+                yield SRTCue(index, start_ms, end_ms, '\n'.join(text_lines))
+            groups = timing.groups()
+            start_ms = _timing_to_ms(*groups[:4])
+            end_ms = _timing_to_ms(*groups[4:])
+            index = pending_index if pending_index is not None else index + 1
+            pending_index = None
+            text_lines = []
+            in_cue = True
+            continue
+
+        if pending_index is not None:
+            # The digit line was dialogue, not the next cue's index
+            if in_cue:
+                text_lines.append(str(pending_index))
+            pending_index = None
+
+        if not line:
+            if in_cue and text_lines:
+                yield SRTCue(index, start_ms, end_ms, '\n'.join(text_lines))
+                text_lines = []
+            in_cue = False
+            continue
+
+        if line.isdigit():
+            pending_index = int(line)
+            continue
+
+        if in_cue:
+            line = HTML_TAG_PATTERN.sub('', line).strip()
+            if line:
+                text_lines.append(line)
+
+    if pending_index is not None and in_cue:
+        # A digit-only last line with no timing after it was dialogue
+        text_lines.append(str(pending_index))
+
+    if in_cue and text_lines:
+        yield SRTCue(index, start_ms, end_ms, '\n'.join(text_lines))
+
+
+def iter_srt_file(file_path: str, encoding: Optional[str] = None) -> Iterator[SRTCue]:
+    """
+    Open an SRT file with a buffered reader and stream its cues
+    The encoding is detected from the file unless given explicitly
+    """
+    if encoding:
+        file = open(file_path, 'r', encoding=encoding, errors='replace')
+    else:
+        file = open_text(file_path)
+    with file:
+        yield from iter_srt_cues(file)
+
 
 class SRTProcessor:
     @staticmethod
@@ -13,52 +111,89 @@ class SRTProcessor:
         Extract and clean text from SRT file
         Returns list of unique dialogue lines
         """
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                lines = file.readlines()
-        except UnicodeDecodeError:
-            # Try with different encoding if utf-8 fails
-            with open(file_path, 'r', encoding='latin-1') as file:
-                lines = file.readlines()
-        
+        return SRTProcessor.unique_lines(iter_srt_file(file_path))
+
+    @staticmethod
+    def unique_lines(cues: Iterable[SRTCue]) -> List[str]:
+        """Collect unique dialogue lines from a stream of cues"""
         clean_lines = []
         seen_lines = set()
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Skip empty lines
-            if not line:
-                continue
-            
-            # Skip timing lines (format: 00:00:00,000 --> 00:00:00,000)
-            if re.match(r'^\d{2}:\d{2}:\d{2},\d{3}', line):
-                continue
-            
-            # Skip sequence numbers
-            if line.isdigit():
-                continue
-            
-            # Remove HTML tags if present
-            line = re.sub(r'<[^>]+>', '', line)
-            
-            # Skip duplicate lines
-            if line not in seen_lines:
-                clean_lines.append(line)
-                seen_lines.add(line)
-        
+
+        for cue in cues:
+            for line in cue.text.split('\n'):
+                # Skip duplicate lines
+                if line not in seen_lines:
+                    clean_lines.append(line)
+                    seen_lines.add(line)
+
         return clean_lines
-    
+
+    @staticmethod
+    def get_text_from_lines(lines: Iterable[str]) -> str:
+        """Convert lines (or cues) to single text string"""
+        return ' '.join(
+            line.text.replace('\n', ' ') if isinstance(line, SRTCue) else line
+            for line in lines
+        )
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """Rough token count for prompt budgeting (about 4 characters per token)"""
+        return len(text) // 4 + 1
+
     @staticmethod
-    def get_text_from_lines(lines: List[str]) -> str:
-        """Convert list of lines to single text string"""
-        return ' '.join(lines)
-    
+    def chunk_lines(lines: Iterable[str], max_tokens: int = 4000) -> List[str]:
+        """
+        Split lines into text chunks of at most max_tokens (estimated)
+        Chunks end on line boundaries; only a line longer than max_tokens
+        is itself split, between words
+        """
+        chunks = []
+        current = []
+        current_tokens = 0
+
+        for line in SRTProcessor._split_long_lines(lines, max_tokens):
+            line_tokens = SRTProcessor.estimate_tokens(line)
+            if current and current_tokens + line_tokens > max_tokens:
+                chunks.append(' '.join(current))
+                current = []
+                current_tokens = 0
+            current.append(line)
+            current_tokens += line_tokens
+
+        if current:
+            chunks.append(' '.join(current))
+
+        return chunks
+
+    @staticmethod
+    def _split_long_lines(lines: Iterable[str], max_tokens: int) -> Iterator[str]:
+        """Yield lines, cutting those longer than max_tokens into pieces at spaces"""
+        for line in lines:
+            if SRTProcessor.estimate_tokens(line) <= max_tokens:
+                yield line
+                continue
+            max_chars = max_tokens * 4  # Same ratio as estimate_tokens()
+            piece = []
+            piece_chars = 0
+            for word in line.split():
+                if piece and piece_chars + len(word) >= max_chars:
+                    yield ' '.join(piece)
+                    piece = []
+                    piece_chars = 0
+                piece.append(word)
+                piece_chars += len(word) + 1
+            if piece:
+                yield ' '.join(piece)
+
     @staticmethod
-    def filter_known_words(words: List[str], known_words: Set[str]) -> List[str]:
+    def filter_known_words(words: List[str], known_words: Set[str],
+                           common_words: Optional[Set[str]] = None) -> List[str]:
         """
-        Filter out known words from the list
+        Filter out known words (and optional common words) from the list
         Case-insensitive comparison
         """
         known_words_lower = {w.lower() for w in known_words}
-        return [w for w in words if w.lower() not in known_words_lower]
\ No newline at end of file
+        if common_words:
+            known_words_lower |= common_words
+        return [w for w in words if w.lower() not in known_words_lower]
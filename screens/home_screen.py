@@ -8,12 +8,8 @@ from kivymd.uix.button import MDRaisedButton
 from kivymd.uix.dialog import MDDialog
 from kivy.lang import Builder
 from kivy.metrics import dp
-from processors.srt_processor import SRTProcessor
-from services.gemini_service import GeminiService
 import os
-import threading
 from kivy.clock import Clock
-from utils.settings_manager import get_settings_manager
 
 Builder.load_string('''
 <HomeScreen>:
@@ -111,6 +107,8 @@ class HomeScreen(MDScreen):
         super().__init__(**kwargs)
         self.file_chooser_dialog = None
         self.progress_dialog = None
+        self.extract_job_id = None
+        self.shown_jobs = set()  # Extract jobs whose words are in the word list
     
     def choose_file(self):
         """Open file chooser using platform file dialog"""
@@ -166,88 +164,119 @@ class HomeScreen(MDScreen):
         if not file_path:
             return
         
+        from kivymd.app import MDApp
+        app = MDApp.get_running_app()
+        
         # Show progress dialog
         self.show_progress_dialog("Processing SRT file...")
         
-        # Process in background thread
-        threading.Thread(
-            target=self.process_srt_file,
-            args=(file_path,),
-            daemon=True
-        ).start()
+        # The word list of the previous file is replaced by this one
+        app.job_queue.finish_review(self.extract_job_id)
+        
+        # Extract on the job queue; progress survives closing the app
+        self.extract_job_id = app.job_queue.create('extract', {'file_path': file_path})
+        app.job_queue.enqueue(self.extract_job_id)
+        self.srt_file_name = os.path.basename(file_path)
     
-    def process_srt_file(self, file_path):
-        """Process SRT file and extract words"""
-        try:
-            from kivymd.app import MDApp
-            from utils.settings_manager import get_settings_manager
-            # settings = get_settings_manager()
-            # srt_lang = settings.get_srt_language()
-            # translate_lang = settings.get_translate_language()
-            app = MDApp.get_running_app()
-            db = app.db_manager
-            
-            # Add SRT file to database
-            filename = os.path.basename(file_path)
-            srt_id = db.add_srt_file(filename)
-            self.srt_file_name=filename
-            # Extract text from SRT
-            processor = SRTProcessor()
-            lines = processor.clean_srt(file_path)
-            
-            if not lines:
-                raise Exception("No text found in SRT file")
-            
-            text = processor.get_text_from_lines(lines)
-            settings = get_settings_manager()
-            api_key = settings.get_next_api_key()
-            if api_key:
-                gemini = GeminiService(api_key)
+    def on_job_event(self, job, event, data):
+        """Job queue listener (called from a worker thread)"""
+        if job['kind'] == 'extract':
+            Clock.schedule_once(lambda dt: self.handle_extract_event(job, event, data), 0)
+    
+    def handle_extract_event(self, job, event, data):
+        """Show extraction progress and results chunk by chunk"""
+        if job['id'] != self.extract_job_id:
+            if event != 'words' or job['id'] in self.shown_jobs:
+                return
+            self.extract_job_id = job['id']  # Job resumed from an earlier session
+        
+        word_list_screen = self.manager.get_screen('word_list')
+        srt_id = job['srtfile']
+        if event == 'words':
+            if job['id'] not in self.shown_jobs:
+                # First useful chunk: open the word list right away
+                self.shown_jobs.add(job['id'])
+                self.navigate_to_word_list(srt_id, data['words'], extracting=True, job_id=job['id'])
             else:
-                raise Exception("No API key configured")
-            # Get important words using Gemini
-            words = gemini.extract_important_words(text)
-            
-            if not words:
-                raise Exception("No words extracted from text")
-            
-            # Filter out known words
-            known_words = set(db.get_all_known_words())
-            filtered_words = processor.filter_known_words(words, known_words)
-            
-            if not filtered_words:
-                Clock.schedule_once(
-                    lambda dt: self.show_info_dialog(
-                        "All Known",
-                        "All extracted words are already in your known words list!"
-                    ),
-                    0
+                word_list_screen.append_words(srt_id, data['words'])
+        elif event == 'progress':
+            if job['id'] not in self.shown_jobs:
+                self.update_progress_dialog(
+                    f"Processing SRT file... ({data['done']}/{data['total']} parts)"
                 )
-                Clock.schedule_once(lambda dt: self.close_progress_dialog(), 0)
-                return
-            
-            # Navigate to word list screen
-            Clock.schedule_once(
-                lambda dt: self.navigate_to_word_list(srt_id, filtered_words),
-                0
-            )
-            
-        except Exception as e:
-            import traceback
-            error_msg = str(e)
-            print(f"Error processing SRT: {error_msg}")
-            print(traceback.format_exc())
-            Clock.schedule_once(
-                lambda dt: self.show_error_dialog(f"Processing error: {error_msg}"),
-                0
-            )
-            Clock.schedule_once(lambda dt: self.close_progress_dialog(), 0)
+        elif event == 'finished':
+            if job['id'] in self.shown_jobs:
+                word_list_screen.finish_extraction(srt_id)
+            elif data.get('all_known'):
+                self.show_all_known()
+        elif event == 'failed':
+            print(f"Error processing SRT: {data['error']}")
+            if job['id'] in self.shown_jobs:
+                word_list_screen.finish_extraction(srt_id)
+            self.show_extract_failed_dialog(job, data['error'])
+            self.close_progress_dialog()
+    
+    def show_extract_failed_dialog(self, job, message):
+        """Show an extraction error with the option to retry the parts that failed"""
+        dialog = MDDialog(
+            title="Error",
+            text=f"Processing error: {message}",
+            buttons=[
+                MDRaisedButton(
+                    text="OK",
+                    on_release=lambda x: dialog.dismiss()
+                ),
+                MDRaisedButton(
+                    text="RETRY",
+                    on_release=lambda x: (dialog.dismiss(), self.retry_extract(job))
+                ),
+            ]
+        )
+        dialog.open()
+    
+    def retry_extract(self, job):
+        """Run a failed extraction again; finished parts are not requested again"""
+        from kivymd.app import MDApp
+        app = MDApp.get_running_app()
+        
+        if not app.job_queue.retry(job['id']):
+            return
+        self.extract_job_id = job['id']
+        if job['id'] in self.shown_jobs:
+            self.manager.get_screen('word_list').resume_extraction(job['srtfile'])
+        else:
+            self.show_progress_dialog("Processing SRT file...")
     
-    def navigate_to_word_list(self, srt_id, words):
+    def restore_review(self):
+        """Reopen the word list of an extraction the user had not finished reviewing"""
+        from kivymd.app import MDApp
+        from services.jobs import get_review_words
+        app = MDApp.get_running_app()
+        
+        job = app.job_queue.get_review_job('extract')
+        if job is None or job['id'] in self.shown_jobs:
+            return
+        words = get_review_words(app.db_manager, job)
+        if not words:
+            app.job_queue.finish_review(job['id'])
+            return
+        self.extract_job_id = job['id']
+        self.shown_jobs.add(job['id'])
+        self.navigate_to_word_list(job['srtfile'], words, job_id=job['id'])
+    
+    def show_all_known(self):
+        """Tell the user there is nothing new"""
+        self.show_info_dialog(
+            "All Known",
+            "All extracted words are already in your known words list!"
+        )
+        self.close_progress_dialog()
+    
+    def navigate_to_word_list(self, srt_id, words, extracting=False, job_id=None):
         """Navigate to word list screen"""
         self.close_progress_dialog()
         word_list_screen = self.manager.get_screen('word_list')
-        word_list_screen.set_words(srt_id, words)
+        word_list_screen.set_words(srt_id, words, extracting=extracting, job_id=job_id)
         self.manager.current = 'word_list'
     
     def show_progress_dialog(self, text):
@@ -258,6 +287,11 @@ class HomeScreen(MDScreen):
         )
         self.progress_dialog.open()
     
+    def update_progress_dialog(self, text):
+        """Update loading dialog text"""
+        if self.progress_dialog:
+            self.progress_dialog.text = text
+    
     def close_progress_dialog(self):
         """Close loading dialog"""
         if self.progress_dialog:
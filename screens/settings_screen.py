@@ -17,6 +17,8 @@ from kivy.metrics import dp
 from kivy.clock import Clock
 from kivy.properties import StringProperty
 from utils.settings_manager import get_settings_manager
+from services.client_pool import release_client
+from services.telemetry import get_telemetry
 
 Builder.load_string('''
 <APIKeyItem>:
@@ -135,7 +137,7 @@ Builder.load_string('''
                     padding: dp(20)
                     spacing: dp(15)
                     size_hint_y: None
-                    height: dp(265)
+                    height: dp(420)
                     elevation: 3
                     
                     MDLabel:
@@ -167,6 +169,27 @@ Builder.load_string('''
                         height: dp(63)
                         on_text_validate: root.update_translate_language(self.text)
                     
+                    MDTextField:
+                        id: common_words_field
+                        hint_text: "Treat Top N Common Words as Known"
+                        text: root.common_words_threshold
+                        helper_text: "Skips frequent words offline (0 to disable)"
+                        helper_text_mode: "on_focus"
+                        input_filter: "int"
+                        size_hint_y: None
+                        height: dp(63)
+                        on_text_validate: root.update_common_words_threshold(self.text)
+                    
+                    MDTextField:
+                        id: dictionary_field
+                        hint_text: "Offline Dictionary File"
+                        text: root.dictionary_path
+                        helper_text: "TSV or StarDict .ifo for this language pair (empty to disable)"
+                        helper_text_mode: "on_focus"
+                        size_hint_y: None
+                        height: dp(63)
+                        on_text_validate: root.update_dictionary_path(self.text)
+                    
                     MDLabel:
                         text: "Press Enter to save changes"
                         font_style: "Caption"
@@ -174,6 +197,37 @@ Builder.load_string('''
                         size_hint_y: None
                         height: dp(20)
                 
+                # API Statistics Card
+                MDCard:
+                    orientation: 'vertical'
+                    padding: dp(20)
+                    spacing: dp(10)
+                    size_hint_y: None
+                    height: self.minimum_height
+                    elevation: 3
+                    
+                    MDLabel:
+                        text: "API Statistics"
+                        font_style: "H6"
+                        size_hint_y: None
+                        height: self.texture_size[1]
+                    
+                    MDSeparator:
+                        height: dp(1)
+                    
+                    MDLabel:
+                        id: stats_label
+                        text: "No API calls recorded yet"
+                        font_style: "Caption"
+                        size_hint_y: None
+                        height: self.texture_size[1]
+                    
+                    MDRaisedButton:
+                        text: "Refresh"
+                        size_hint_x: 0.5
+                        pos_hint: {'center_x': 0.5}
+                        on_release: root.refresh_stats()
+                
                 # Info Card
                 MDCard:
                     orientation: 'vertical'
@@ -265,6 +319,14 @@ class SettingsScreen(MDScreen):
     @property
     def translate_language(self):
         return self.settings_manager.get_translate_language()
+
+    @property
+    def common_words_threshold(self):
+        return str(self.settings_manager.get_common_words_threshold())
+    
+    @property
+    def dictionary_path(self):
+        return self.settings_manager.get_dictionary_path() or ""
     
     def on_enter(self):
         """Called when screen is displayed"""
@@ -274,6 +336,16 @@ class SettingsScreen(MDScreen):
             self.ids.srt_language_field.text = self.srt_language
         if hasattr(self.ids, 'translate_language_field'):
             self.ids.translate_language_field.text = self.translate_language
+        if hasattr(self.ids, 'common_words_field'):
+            self.ids.common_words_field.text = self.common_words_threshold
+        if hasattr(self.ids, 'dictionary_field'):
+            self.ids.dictionary_field.text = self.dictionary_path
+        self.refresh_stats()
+    
+    def refresh_stats(self):
+        """Show latency percentiles per API key and meaning batch size"""
+        if hasattr(self.ids, 'stats_label'):
+            self.ids.stats_label.text = get_telemetry().stats_text()
     
     def load_api_keys(self):
         """Load API keys from settings"""
@@ -302,6 +374,27 @@ class SettingsScreen(MDScreen):
             else:
                 self.show_toast("Failed to update translation language")
     
+    def update_common_words_threshold(self, value):
+        """Update common words threshold setting"""
+        try:
+            threshold = int(value.strip())
+        except (AttributeError, ValueError):
+            self.show_toast("Please enter a whole number")
+            return
+        
+        if self.settings_manager.set_common_words_threshold(threshold):
+            self.show_toast(f"Top {threshold} common words treated as known")
+        else:
+            self.show_toast("Failed to update common words threshold")
+    
+    def update_dictionary_path(self, path):
+        """Update offline dictionary setting"""
+        path = path.strip()
+        if self.settings_manager.set_dictionary_path(path or None):
+            self.show_toast("Offline dictionary saved" if path else "Offline dictionary disabled")
+        else:
+            self.show_toast("Dictionary file not found")
+    
     def show_add_key_dialog(self):
         """Show dialog to add new API key"""
         content = MDBoxLayout(
@@ -389,6 +482,7 @@ class SettingsScreen(MDScreen):
     def delete_api_key(self, key, dialog):
         """Delete API key from settings"""
         if self.settings_manager.remove_api_key(key):
+            release_client(key)
             dialog.dismiss()
             self.show_toast("API key removed")
             Clock.schedule_once(lambda dt: self.load_api_keys(), 0)
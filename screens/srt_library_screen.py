@@ -18,9 +18,7 @@ from kivy.lang import Builder
 from kivy.metrics import dp
 from kivy.clock import Clock
 from kivy.properties import StringProperty
-from services.gemini_service import GeminiService
 from utils.settings_manager import get_settings_manager
-import threading
 
 Builder.load_string('''
 <SRTFileItem>:
@@ -182,6 +180,7 @@ class SRTLibraryScreen(MDScreen):
         super().__init__(**kwargs)
         self.current_dialog = None
         self.progress_dialog = None
+        self.recheck_job_id = None
     
     def on_enter(self):
         """Called when screen is displayed"""
@@ -251,15 +250,8 @@ class SRTLibraryScreen(MDScreen):
         db = app.db_manager
         
         try:
-            # Delete all words for this SRT
-            conn = db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM words WHERE srtfile = ?', (srt_id,))
-            
-            # Delete the SRT file record
-            cursor.execute('DELETE FROM srtfiles WHERE id = ?', (srt_id,))
-            
-            conn.commit()
+            # Delete all words for this SRT and the SRT file record
+            db.delete_srt_file(srt_id)
             
             # Close dialog
             dialog.dismiss()
@@ -319,78 +311,38 @@ class SRTLibraryScreen(MDScreen):
         dialog.open()
     
     def start_recheck_process(self, srt_id, words_to_update, confirm_dialog):
-        """Start the recheck process in background"""
+        """Start the recheck process on the job queue"""
+        from kivymd.app import MDApp
+        app = MDApp.get_running_app()
         confirm_dialog.dismiss()
         
+        if not get_settings_manager().has_api_keys():
+            self.show_error_dialog("No API key configured")
+            return
+        
         self.show_progress_dialog(f"Fetching meanings for {len(words_to_update)} words...")
         
-        # Process in background thread
-        threading.Thread(
-            target=self.process_recheck_meanings,
-            args=(srt_id, words_to_update),
-            daemon=True
-        ).start()
+        # Updated words are committed with a checkpoint, so an interrupted
+        # recheck resumes with the words it had not reached
+        self.recheck_job_id = app.job_queue.create('recheck', {'words': words_to_update}, srt_id)
+        app.job_queue.enqueue(self.recheck_job_id)
     
-    def process_recheck_meanings(self, srt_id, words_to_update):
-        """Process and update word meanings in background"""
-        try:
-            from kivymd.app import MDApp
-            app = MDApp.get_running_app()
-            db = app.db_manager
-            
-            # Get settings for API key and translation language
-            settings = get_settings_manager()
-            api_key = settings.get_next_api_key()
-            
-            if not api_key:
-                Clock.schedule_once(
-                    lambda dt: self.show_error_dialog("No API key configured"),
-                    0
-                )
-                Clock.schedule_once(lambda dt: self.close_progress_dialog(), 0)
-                return
-            
-            translate_lang = settings.get_translate_language()
-            
-            # Get meanings from Gemini
-            gemini = GeminiService(api_key)
-            meanings_dict = gemini.get_word_meanings_batch(words_to_update)
-            
-            # Update database
-            conn = db.get_connection()
-            cursor = conn.cursor()
-            
-            updated_count = 0
-            for word in words_to_update:
-                if word in meanings_dict:
-                    meaning_text = meanings_dict[word]['meaning']
-                    examples_text = meanings_dict[word]['examples']
-                    full_meaning = f"{meaning_text} | Examples: {examples_text}"
-                    
-                    # Update the word meaning
-                    cursor.execute(
-                        'UPDATE words SET meaning = ? WHERE word = ? AND srtfile = ?',
-                        (full_meaning, word, srt_id)
-                    )
-                    updated_count += 1
-            
-            conn.commit()
-            
-            # Show success message
-            Clock.schedule_once(
-                lambda dt: self.finish_recheck_process(updated_count),
-                0
-            )
-            
-        except Exception as e:
-            print(f"Error rechecking meanings: {e}")
-            import traceback
-            traceback.print_exc()
-            Clock.schedule_once(
-                lambda dt: self.show_error_dialog(f"Error: {str(e)}"),
-                0
-            )
-            Clock.schedule_once(lambda dt: self.close_progress_dialog(), 0)
+    def on_job_event(self, job, event, data):
+        """Job queue listener (called from a worker thread)"""
+        if job['kind'] == 'recheck' and job['id'] == self.recheck_job_id:
+            Clock.schedule_once(lambda dt: self.handle_recheck_event(event, data), 0)
+    
+    def handle_recheck_event(self, event, data):
+        """Show recheck progress and the result"""
+        if event == 'progress':
+            self.update_progress_dialog(f"Rechecking meanings... ({data['done']}/{data['total']} words)")
+        elif event == 'finished':
+            self.recheck_job_id = None
+            self.finish_recheck_process(data['updated'])
+        elif event == 'failed':
+            self.recheck_job_id = None
+            self.close_progress_dialog()
+            self.show_error_dialog(f"Error: {data['error']}")
     
     def finish_recheck_process(self, updated_count):
         """Finish recheck process and show result"""
@@ -447,6 +399,11 @@ class SRTLibraryScreen(MDScreen):
         )
         self.progress_dialog.open()
     
+    def update_progress_dialog(self, text):
+        """Update loading dialog text"""
+        if self.progress_dialog:
+            self.progress_dialog.text = text
+    
     def close_progress_dialog(self):
         """Close loading dialog"""
         if self.progress_dialog:
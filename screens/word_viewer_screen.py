@@ -3,6 +3,7 @@ Word Viewer Screen - Complete Fixed Version
 View words and meanings from a specific SRT file
 """
 
+import threading
 from kivymd.uix.screen import MDScreen
 from kivymd.uix.button import MDRaisedButton
 from kivymd.uix.boxlayout import MDBoxLayout
@@ -16,6 +17,9 @@ from kivy.lang import Builder
 from kivy.metrics import dp
 from kivy.clock import Clock
 from kivy.properties import StringProperty
+from database.db_manager import SEARCH_PAGE_SIZE
+
+SEARCH_DELAY = 0.25  # Seconds of no typing before a search runs
 
 Builder.load_string('''
 <WordViewItem>:
@@ -91,10 +95,25 @@ Builder.load_string('''
             title: "Words"
             elevation: 2
             left_action_items: [["arrow-left", lambda x: root.go_back()]]
+            right_action_items: [["folder-search-outline", lambda x: root.toggle_search_scope()]]
+        
+        MDBoxLayout:
+            size_hint_y: None
+            height: dp(64)
+            padding: [dp(10), dp(8), dp(10), 0]
+            
+            MDTextField:
+                id: search_field
+                hint_text: root.search_hint
+                icon_right: "magnify"
+                size_hint_y: None
+                height: dp(48)
+                on_text: root.on_search_text(self.text)
         
         RecycleView:
             id: words_recycler
             viewclass: 'WordViewItem'
+            on_scroll_stop: root.on_list_scroll(self)
             
             RecycleBoxLayout:
                 default_size: None, dp(140)
@@ -146,14 +165,57 @@ class WordViewItem(RecycleDataViewBehavior, MDBoxLayout):
             print(f"Error marking word as learned: {e}")
 
 class WordViewerScreen(MDScreen):
+    search_hint = StringProperty("Search this file (word, meaning, examples)")
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.srt_id = None
         self.srt_name = ""
+        self.word_items = []  # Items of the SRT file, shown when not searching
+        self.search_query = ""
+        self.search_all_files = False
+        self.search_after = None  # Cursor of the next page of results
+        self.search_count = 0
+        self.search_has_more = False
+        self.search_loading = False  # A page is being fetched
+        self._search_event = None
+        self._search_generation = 0  # Results of older searches are dropped
+    
+    @staticmethod
+    def make_item(word_data):
+        """RecycleView item for a words row"""
+        from utils.persian_text_helper import fix_persian_text
+        
+        word = word_data['word']
+        meaning = word_data['meaning'] or ""
+        
+        # Parse meaning
+        if '|' in meaning:
+            parts = meaning.split('|', 1)
+            persian_meaning = parts[0].strip()
+            examples = parts[1].replace('Examples:', '').strip()
+            
+            # Fix Persian text for RTL display
+            persian_meaning = fix_persian_text(persian_meaning)
+            
+            # Truncate if too long
+            if len(examples) > 100:
+                examples = examples[:100] + "..."
+            examples_display = f"Ex: {examples}" if examples else ""
+        else:
+            persian_meaning = meaning[:100] + "..." if len(meaning) > 100 else meaning
+            # Fix Persian text
+            persian_meaning = fix_persian_text(persian_meaning)
+            examples_display = ""
+        
+        return {
+            'word': word,
+            'meaning': persian_meaning,
+            'examples': examples_display
+        }
     
     def set_words(self, srt_id, srt_name, words_data):
         """Set words to display"""
-        from utils.persian_text_helper import fix_persian_text
         from kivymd.app import MDApp
         
         app = MDApp.get_running_app()
@@ -165,59 +227,117 @@ class WordViewerScreen(MDScreen):
         # Get known words to filter them out
         known_words = set(db.get_all_known_words())
         
-        # Prepare data for RecycleView
-        recycler_data = []
-        for word_data in words_data:
-            word = word_data['word']
-            
-            # Skip if already known
-            if word.lower() in known_words:
-                continue
-            
-            meaning = word_data['meaning']
-            
-            # Parse meaning
-            if '|' in meaning:
-                parts = meaning.split('|', 1)
-                persian_meaning = parts[0].strip()
-                examples = parts[1].replace('Examples:', '').strip()
-                
-                # Fix Persian text for RTL display
-                persian_meaning = fix_persian_text(persian_meaning)
-                
-                # Truncate if too long
-                if len(examples) > 100:
-                    examples = examples[:100] + "..."
-                examples_display = f"Ex: {examples}" if examples else ""
-            else:
-                persian_meaning = meaning[:100] + "..." if len(meaning) > 100 else meaning
-                # Fix Persian text
-                persian_meaning = fix_persian_text(persian_meaning)
-                examples_display = ""
-            
-            recycler_data.append({
-                'word': word,
-                'meaning': persian_meaning,
-                'examples': examples_display
-            })
+        # Prepare data for RecycleView, skipping words already known
+        self.word_items = [
+            self.make_item(word_data)
+            for word_data in words_data
+            if word_data['word'].lower() not in known_words
+        ]
         
+        # A new file starts without a search
+        self.search_query = ""
+        self.ids.search_field.text = ""
+        self.show_word_items()
+    
+    def show_word_items(self):
+        """Show all words of the SRT file"""
         # Update title with filtered count
-        self.ids.topbar.title = f"{srt_name} ({len(recycler_data)} words)"
-        self.ids.words_recycler.data = recycler_data
+        self.ids.topbar.title = f"{self.srt_name} ({len(self.word_items)} words)"
+        self.ids.words_recycler.data = list(self.word_items)
+    
+    def toggle_search_scope(self):
+        """Switch searching between this SRT file and the whole library"""
+        self.search_all_files = not self.search_all_files
+        if self.search_all_files:
+            self.search_hint = "Search all files (word, meaning, examples)"
+        else:
+            self.search_hint = "Search this file (word, meaning, examples)"
+        if self.search_query:
+            self.run_search()
+    
+    def on_search_text(self, text):
+        """Search once typing pauses"""
+        self.search_query = text.strip()
+        if self._search_event:
+            self._search_event.cancel()
+        if not self.search_query:
+            self._search_generation += 1
+            self.search_loading = False
+            self.show_word_items()
+            return
+        self._search_event = Clock.schedule_once(lambda dt: self.run_search(), SEARCH_DELAY)
+    
+    def run_search(self):
+        """Show the first page of results for the current query"""
+        self._search_generation += 1
+        self.search_after = None
+        self.search_count = 0
+        self.search_loading = False
+        self.ids.words_recycler.data = []
+        self.load_search_page()
+        self.ids.words_recycler.scroll_y = 1
+    
+    def load_search_page(self):
+        """Fetch the next page of ranked search results in the background"""
+        if self.search_loading:
+            return
+        self.search_loading = True
+        threading.Thread(
+            target=self._search_thread,
+            args=(self._search_generation, self.search_query, self.search_after,
+                  None if self.search_all_files else self.srt_id),
+            daemon=True
+        ).start()
+    
+    def _search_thread(self, generation, query, after, srtfile_id):
+        """Run a search query (called from background thread)"""
+        from kivymd.app import MDApp
+        db = MDApp.get_running_app().db_manager
+        
+        try:
+            rows, next_after = db.search_words(
+                query,
+                limit=SEARCH_PAGE_SIZE,
+                after=after,
+                srtfile_id=srtfile_id,
+                unknown_only=True
+            )
+        except Exception as e:
+            print(f"Error searching words: {e}")
+            rows, next_after = [], None
+        Clock.schedule_once(lambda dt: self.show_search_page(generation, rows, next_after), 0)
+    
+    def show_search_page(self, generation, rows, next_after):
+        """Append a page of search results unless a newer search started"""
+        if generation != self._search_generation:
+            return
+        self.search_loading = False
+        self.search_after = next_after
+        self.search_count += len(rows)
+        self.search_has_more = next_after is not None
+        self.ids.words_recycler.data.extend(self.make_item(row) for row in rows)
+        
+        more = "+" if self.search_has_more else ""
+        self.ids.topbar.title = f"'{self.search_query}' ({self.search_count}{more} results)"
+    
+    def on_list_scroll(self, recycler):
+        """Load more search results when the list is scrolled to the end"""
+        if self.search_query and self.search_has_more and recycler.scroll_y <= 0.05:
+            self.load_search_page()
     
     def remove_word_from_list(self, word):
         """Remove a word from the displayed list"""
-        # Get current data
-        current_data = self.ids.words_recycler.data
-        
         # Filter out the word
-        new_data = [item for item in current_data if item['word'] != word]
+        self.word_items = [item for item in self.word_items if item['word'] != word]
         
         # Update RecycleView
-        self.ids.words_recycler.data = new_data
-        
-        # Update title
-        self.ids.topbar.title = f"{self.srt_name} ({len(new_data)} words)"
+        if self.search_query:
+            current_data = self.ids.words_recycler.data
+            new_data = [item for item in current_data if item['word'] != word]
+            self.search_count -= len(current_data) - len(new_data)
+            self.ids.words_recycler.data = new_data
+        else:
+            self.show_word_items()
     
     def mark_word_learned(self, word):
         """Mark word as learned"""
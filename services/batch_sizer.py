@@ -0,0 +1,62 @@
+"""
+Adaptive Batch Sizer
+Picks how many words go into each meanings request (AIMD)
+The size grows by a fixed step while batches come back complete and fast,
+and is cut by a factor on truncation, timeouts or many missing words
+"""
+
+import threading
+
+DEFAULT_MEANINGS_BATCH_SIZE = 50
+MIN_MEANINGS_BATCH_SIZE = 5
+MAX_MEANINGS_BATCH_SIZE = 200
+
+class AdaptiveBatchSizer:
+    def __init__(self, initial: int = DEFAULT_MEANINGS_BATCH_SIZE,
+                 minimum: int = MIN_MEANINGS_BATCH_SIZE, maximum: int = MAX_MEANINGS_BATCH_SIZE,
+                 increase: int = 5, decrease: float = 0.5, target_seconds: float = 30.0,
+                 missing_tolerance: float = 0.1):
+        """
+        increase: words added after a complete, fast full-size batch
+        decrease: factor applied to the failed batch's size
+        target_seconds: batches slower than this count as too large
+        missing_tolerance: share of words a batch may leave out and still
+        count as complete (single words the model has no answer for are
+        not a sign of truncation)
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.target_seconds = target_seconds
+        self.missing_tolerance = missing_tolerance
+        self._size = self._clamp(initial)
+        self._lock = threading.Lock()
+
+    def _clamp(self, size: int) -> int:
+        return max(self.minimum, min(self.maximum, int(size)))
+
+    @property
+    def size(self) -> int:
+        """Size for the next batch"""
+        return self._size
+
+    def record(self, requested: int, returned: int, seconds: float, timed_out: bool = False):
+        """
+        Adjust the size from the first response of a batch
+        requested / returned: words asked for and words that came back
+        Retries of words missing from a response must not be recorded
+        """
+        truncated = requested - returned > requested * self.missing_tolerance
+        with self._lock:
+            if timed_out or truncated or seconds > self.target_seconds:
+                # A much smaller batch (the remainder of a job) failing says
+                # nothing about the current size
+                if requested < self._size * self.decrease:
+                    return
+                # Shrink relative to the failed batch, so several failures of
+                # batches sent at the same size only shrink once
+                self._size = self._clamp(min(self._size, requested * self.decrease))
+            elif requested >= self._size:
+                # Only full-size batches prove the current size works
+                self._size = self._clamp(self._size + self.increase)
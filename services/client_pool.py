@@ -0,0 +1,76 @@
+"""
+Client Pool
+Process-wide registry of Gemini clients keyed by API key
+Each client keeps its HTTP connection pool alive, so jobs started from
+any screen reuse the same keep-alive connections instead of paying a
+new TLS handshake every time
+
+Clients are created by a replaceable factory, so the whole app can run
+against a local backend (see services/fake_gemini.py)
+"""
+
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+# Set to "fake" to use the offline FakeGeminiClient instead of the real API
+BACKEND_ENV_VAR = 'VOCAB_GEMINI_BACKEND'
+
+def _default_client_factory(api_key: str):
+    if os.environ.get(BACKEND_ENV_VAR) == 'fake':
+        from services.fake_gemini import FakeGeminiClient
+        return FakeGeminiClient(api_key=api_key)
+    from google import genai
+    return genai.Client(api_key=api_key)
+
+_client_factory: Callable[[str], object] = _default_client_factory
+_clients: Dict[str, object] = {}
+_clients_lock = threading.Lock()
+
+def set_client_factory(factory: Optional[Callable[[str], object]] = None):
+    """
+    Create clients with factory(api_key) from now on
+    Pass None to go back to genai.Client; existing clients are dropped
+    """
+    global _client_factory
+    with _clients_lock:
+        _client_factory = factory or _default_client_factory
+        _clients.clear()
+
+def get_client(api_key: str):
+    """Get the shared client for an API key, creating it on first use"""
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            client = _client_factory(api_key)
+            _clients[api_key] = client
+        return client
+
+def release_client(api_key: str):
+    """Forget the client of a removed API key"""
+    with _clients_lock:
+        _clients.pop(api_key, None)
+
+def warm_up(api_keys: List[str], model: Optional[str] = None):
+    """
+    Create clients for all keys and open their connections
+    A lightweight model metadata request completes the TLS handshake
+    Meant to run on a background thread at app start; errors are ignored
+    """
+    for api_key in api_keys:
+        try:
+            client = get_client(api_key)
+            if model:
+                client.models.get(model=model)
+        except Exception as e:
+            print(f"Client warm-up failed: {e}")
+
+def start_warm_up(api_keys: List[str], model: Optional[str] = None) -> threading.Thread:
+    """Run warm_up on a daemon thread"""
+    thread = threading.Thread(
+        target=warm_up,
+        args=(list(api_keys), model),
+        daemon=True
+    )
+    thread.start()
+    return thread
@@ -0,0 +1,285 @@
+"""
+Dictionary Provider
+Meaning providers that answer lookups before any Gemini request
+LocalDictionaryProvider loads a user-supplied TSV or StarDict dictionary
+into an indexed SQLite file once, then answers lookups locally (a primary
+key lookup per word, no network), so common vocabulary works offline
+"""
+
+import gzip
+import os
+import re
+import sqlite3
+import struct
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional, Tuple
+from utils.encoding_detector import open_text
+from utils.settings_manager import get_settings_manager
+from utils.word_normalizer import normalize_word
+
+# Built dictionary indexes live next to the app database
+DICTIONARY_INDEX_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dictionaries')
+
+# Max host parameters per IN (...) query / rows per insert batch
+SQL_BATCH_SIZE = 500
+
+# Longest meaning kept from a dictionary entry
+MAX_MEANING_CHARS = 300
+
+TAG_PATTERN = re.compile(r'<[^>]+>')
+WHITESPACE_PATTERN = re.compile(r'\s*\n\s*|\s{2,}')
+
+class MeaningProvider(ABC):
+    """Source of word meanings consulted before Gemini"""
+
+    name = "provider"
+
+    @abstractmethod
+    def lookup(self, words: List[str], srt_language: str, translate_language: str) -> Dict[str, Dict[str, str]]:
+        """
+        Look up meanings for words
+        Returns dict keyed by the given spelling: {word: {'meaning': ..., 'examples': ...}}
+        """
+
+    def close(self):
+        pass
+
+def clean_definition(text: str) -> str:
+    """Flatten a dictionary definition to one short line"""
+    text = TAG_PATTERN.sub(' ', text)
+    text = WHITESPACE_PATTERN.sub('; ', text.strip())
+    if len(text) > MAX_MEANING_CHARS:
+        text = text[:MAX_MEANING_CHARS].rsplit(' ', 1)[0] + '...'
+    return text
+
+def iter_tsv_entries(path: str) -> Iterator[Tuple[str, str, str]]:
+    """Read 'word<TAB>meaning[<TAB>examples]' lines; '#' starts a comment line"""
+    with open_text(path) as f:
+        for line in f:
+            line = line.rstrip('\r\n')
+            if not line or line.startswith('#'):
+                continue
+            parts = line.split('\t')
+            if len(parts) >= 2 and parts[0].strip() and parts[1].strip():
+                examples = parts[2].strip() if len(parts) > 2 else ''
+                yield parts[0].strip(), clean_definition(parts[1]), examples
+
+def read_stardict_info(ifo_path: str) -> Dict[str, str]:
+    """Parse the key=value lines of a StarDict .ifo file"""
+    info = {}
+    with open(ifo_path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            key, sep, value = line.partition('=')
+            if sep:
+                info[key.strip()] = value.strip()
+    return info
+
+def iter_stardict_entries(ifo_path: str) -> Iterator[Tuple[str, str, str]]:
+    """Read entries of a StarDict dictionary (.ifo + .idx + .dict or .dict.dz)"""
+    base = ifo_path[:-len('.ifo')]
+    info = read_stardict_info(ifo_path)
+    offset_format = '>Q' if info.get('idxoffsetbits') == '64' else '>I'
+    offset_size = struct.calcsize(offset_format)
+    type_sequence = info.get('sametypesequence', '')
+
+    with open(base + '.idx', 'rb') as f:
+        index = f.read()
+
+    # Entries are read by offset, so the definitions are never all in memory;
+    # offsets mostly increase, which keeps seeking in the gzip stream forward
+    if os.path.exists(base + '.dict'):
+        data = open(base + '.dict', 'rb')
+    else:
+        data = gzip.open(base + '.dict.dz', 'rb')  # dictzip is gzip compatible
+
+    with data:
+        pos = 0
+        while pos < len(index):
+            end = index.index(b'\0', pos)
+            word = index[pos:end].decode('utf-8', errors='replace')
+            pos = end + 1
+            (offset,) = struct.unpack_from(offset_format, index, pos)
+            (size,) = struct.unpack_from('>I', index, pos + offset_size)
+            pos += offset_size + 4
+
+            data.seek(offset)
+            record = data.read(size)
+            if not type_sequence:
+                # Each field starts with its type; only the first text field is used
+                record = record[1:].split(b'\0', 1)[0]
+            elif len(type_sequence) > 1:
+                record = record.split(b'\0', 1)[0]
+            definition = clean_definition(record.decode('utf-8', errors='replace'))
+            if word and definition:
+                yield word, definition, ''
+
+class LocalDictionaryProvider(MeaningProvider):
+    """Meanings from an indexed SQLite copy of a local dictionary"""
+
+    name = "dictionary"
+
+    def __init__(self, index_path: str):
+        self.index_path = index_path
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        meta = self._meta()
+        self.srt_language = meta.get('srt_language', '')
+        self.translate_language = meta.get('translate_language', '')
+
+    def get_connection(self):
+        """Get thread-local read connection"""
+        if getattr(self._local, 'connection', None) is None:
+            self._local.connection = sqlite3.connect(self.index_path, check_same_thread=False)
+            with self._lock:
+                self._connections.append(self._local.connection)
+        return self._local.connection
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _meta(self) -> Dict[str, str]:
+        cursor = self.get_connection().execute('SELECT key, value FROM meta')
+        return dict(cursor.fetchall())
+
+    def lookup(self, words: List[str], srt_language: str, translate_language: str) -> Dict[str, Dict[str, str]]:
+        # A dictionary only answers for the language pair it was built for
+        if (srt_language.strip().lower(), translate_language.strip().lower()) != (self.srt_language, self.translate_language):
+            return {}
+
+        by_norm = {}
+        for word in words:
+            by_norm.setdefault(normalize_word(word), []).append(word)
+        norms = [n for n in by_norm if n]
+
+        cursor = self.get_connection().cursor()
+        result = {}
+        for i in range(0, len(norms), SQL_BATCH_SIZE):
+            chunk = norms[i:i + SQL_BATCH_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(
+                f'SELECT word_norm, meaning, examples FROM entries WHERE word_norm IN ({placeholders})',
+                chunk
+            )
+            for word_norm, meaning, examples in cursor.fetchall():
+                for word in by_norm[word_norm]:
+                    result[word] = {'meaning': meaning, 'examples': examples or ''}
+        return result
+
+    @staticmethod
+    def index_path_for(source_path: str) -> str:
+        return os.path.join(DICTIONARY_INDEX_DIR, os.path.basename(source_path) + '.sqlite')
+
+    @staticmethod
+    def source_signature(source_path: str) -> str:
+        stat = os.stat(source_path)
+        return f"{os.path.abspath(source_path)}|{stat.st_size}|{int(stat.st_mtime)}"
+
+    @classmethod
+    def build(cls, source_path: str, srt_language: str, translate_language: str,
+              index_path: Optional[str] = None) -> 'LocalDictionaryProvider':
+        """
+        Load a TSV (.tsv/.txt) or StarDict (.ifo) dictionary into an indexed SQLite file
+        Several entries for one word are joined into one meaning
+        """
+        index_path = index_path or cls.index_path_for(source_path)
+        os.makedirs(os.path.dirname(index_path) or '.', exist_ok=True)
+        if source_path.lower().endswith('.ifo'):
+            entries = iter_stardict_entries(source_path)
+        else:
+            entries = iter_tsv_entries(source_path)
+
+        temp_path = index_path + '.tmp'
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        conn = sqlite3.connect(temp_path)
+        try:
+            conn.execute('PRAGMA journal_mode = OFF')
+            conn.execute('PRAGMA synchronous = OFF')
+            conn.execute('CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)')
+            conn.execute('''
+                CREATE TABLE entries (
+                    word_norm TEXT PRIMARY KEY,
+                    word TEXT,
+                    meaning TEXT,
+                    examples TEXT
+                ) WITHOUT ROWID
+            ''')
+            insert = '''
+                INSERT INTO entries (word_norm, word, meaning, examples) VALUES (?, ?, ?, ?)
+                ON CONFLICT(word_norm) DO UPDATE SET meaning = meaning || '; ' || excluded.meaning
+            '''
+            rows = []
+            for word, meaning, examples in entries:
+                word_norm = normalize_word(word)
+                if word_norm:
+                    rows.append((word_norm, word, meaning, examples))
+                if len(rows) >= SQL_BATCH_SIZE:
+                    conn.executemany(insert, rows)
+                    rows = []
+            if rows:
+                conn.executemany(insert, rows)
+            conn.executemany('INSERT INTO meta (key, value) VALUES (?, ?)', [
+                ('source', cls.source_signature(source_path)),
+                ('srt_language', srt_language.strip().lower()),
+                ('translate_language', translate_language.strip().lower()),
+            ])
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(temp_path, index_path)
+        return cls(index_path)
+
+    @classmethod
+    def open(cls, source_path: str, srt_language: str, translate_language: str) -> 'LocalDictionaryProvider':
+        """Open the index of a dictionary, (re)building it if the source file changed"""
+        index_path = cls.index_path_for(source_path)
+        if os.path.exists(index_path):
+            try:
+                provider = cls(index_path)
+                if provider._meta().get('source') == cls.source_signature(source_path):
+                    return provider
+                provider.close()
+            except sqlite3.Error as e:
+                print(f"Rebuilding dictionary index: {e}")
+        print(f"Building dictionary index for {os.path.basename(source_path)}...")
+        return cls.build(source_path, srt_language, translate_language, index_path)
+
+# Singleton state
+_providers: List[MeaningProvider] = []
+_providers_source = None
+_providers_lock = threading.Lock()
+
+def get_meaning_providers() -> List[MeaningProvider]:
+    """
+    Get the local providers configured in settings (opened once per dictionary file)
+
+    Usage:
+        from services.dictionary_provider import get_meaning_providers
+
+        gemini = GeminiService(api_key, providers=get_meaning_providers())
+    """
+    global _providers, _providers_source
+    settings = get_settings_manager()
+    path = settings.get_dictionary_path()
+    source = (path, settings.get_srt_language().lower(), settings.get_translate_language().lower())
+    with _providers_lock:
+        if source != _providers_source:
+            for provider in _providers:
+                provider.close()
+            _providers = []
+            _providers_source = source
+            if path:
+                try:
+                    _providers = [LocalDictionaryProvider.open(path, source[1], source[2])]
+                except (OSError, ValueError, sqlite3.Error) as e:
+                    print(f"Error loading dictionary {path}: {e}")
+        return list(_providers)
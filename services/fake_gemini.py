@@ -0,0 +1,260 @@
+"""
+Fake Gemini Backend
+Local stand-in for genai.Client used for offline benchmarks and load tests
+Returns deterministic word lists and meanings in the formats GeminiService
+expects, and can simulate latency, server errors, 429 responses and
+truncated output
+
+Usage:
+    from functools import partial
+    from services.client_pool import set_client_factory
+    from services.fake_gemini import FakeGeminiClient, lognormal_latency
+
+    set_client_factory(partial(FakeGeminiClient, latency=lognormal_latency(0.4), rate_limit_rate=0.05))
+
+Setting the environment variable VOCAB_GEMINI_BACKEND=fake runs the whole
+app against the default fake client.
+"""
+
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+(?:['\u2019][^\W\d_]+)*")
+
+# Latency distributions: called with the client's random generator, return seconds
+def fixed_latency(seconds: float) -> Callable[[random.Random], float]:
+    return lambda rng: seconds
+
+def uniform_latency(low: float, high: float) -> Callable[[random.Random], float]:
+    return lambda rng: rng.uniform(low, high)
+
+def lognormal_latency(median: float, sigma: float = 0.5) -> Callable[[random.Random], float]:
+    """Long-tailed latency, as seen from real API calls"""
+    return lambda rng: median * rng.lognormvariate(0.0, sigma)
+
+class FakeAPIError(Exception):
+    """Error raised by the fake client; message mimics the API's 'code STATUS' text"""
+
+    def __init__(self, code: int, status: str, message: str = ''):
+        super().__init__(f"{code} {status}. {message}".strip())
+        self.code = code
+        self.status = status
+
+class FakeUsage:
+    def __init__(self, prompt_tokens: int, output_tokens: int):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = output_tokens
+        self.total_token_count = prompt_tokens + output_tokens
+
+class FakeResponse:
+    def __init__(self, text: str, usage_metadata: Optional[FakeUsage] = None):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+class FakeGeminiClient:
+    """
+    Drop-in replacement for genai.Client(api_key=...)
+    Supports models.generate_content, models.generate_content_stream,
+    models.get and their aio counterparts
+
+    latency: distribution for the delay before a response (or first chunk)
+    chunk_delay: generation time per stream chunk; a non-streamed response
+    waits for all of its chunks before returning
+    error_rate / rate_limit_rate / truncate_rate: probability of a 500,
+    a 429 or a response cut off part way through
+    min_word_length: extraction returns words at least this long
+    """
+
+    def __init__(self, api_key: Optional[str] = None,
+                 latency: Callable[[random.Random], float] = fixed_latency(0.0),
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 truncate_rate: float = 0.0, min_word_length: int = 6,
+                 stream_chunk_chars: int = 64, chunk_delay: float = 0.0,
+                 seed: Optional[int] = 0):
+        self.api_key = api_key
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.truncate_rate = truncate_rate
+        self.min_word_length = min_word_length
+        self.stream_chunk_chars = stream_chunk_chars
+        self.chunk_delay = chunk_delay
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {
+            'calls': 0, 'errors': 0, 'rate_limited': 0, 'truncated': 0,
+            'in_flight': 0, 'max_in_flight': 0,
+        }
+        self.models = _FakeModels(self)
+        self.aio = _FakeAio(self)
+
+    def stats(self) -> Dict[str, int]:
+        """Call counters, including the highest number of concurrent requests"""
+        with self._lock:
+            return dict(self._stats)
+
+    def _begin(self):
+        """Draw the outcome of one request; returns (delay, error, truncate_at)"""
+        with self._lock:
+            self._stats['calls'] += 1
+            self._stats['in_flight'] += 1
+            self._stats['max_in_flight'] = max(self._stats['max_in_flight'], self._stats['in_flight'])
+            delay = max(0.0, self.latency(self._rng))
+            roll = self._rng.random()
+            error = None
+            if roll < self.rate_limit_rate:
+                self._stats['rate_limited'] += 1
+                error = FakeAPIError(429, 'RESOURCE_EXHAUSTED', 'Resource has been exhausted (e.g. check quota).')
+            elif roll < self.rate_limit_rate + self.error_rate:
+                self._stats['errors'] += 1
+                error = FakeAPIError(500, 'INTERNAL', 'An internal error has occurred.')
+            truncate_at = None
+            if error is None and self._rng.random() < self.truncate_rate:
+                self._stats['truncated'] += 1
+                truncate_at = self._rng.uniform(0.2, 0.9)
+            return delay, error, truncate_at
+
+    def _end(self):
+        with self._lock:
+            self._stats['in_flight'] -= 1
+
+    def _respond(self, contents: str, config, truncate_at: Optional[float]) -> FakeResponse:
+        text = self.render(contents, config)
+        if truncate_at is not None:
+            text = text[:int(len(text) * truncate_at)]
+        usage = FakeUsage(len(contents) // 4 + 1, len(text) // 4 + 1)
+        return FakeResponse(text, usage)
+
+    def _generation_time(self, response: FakeResponse) -> float:
+        return self.chunk_delay * len(self._chunks(response))
+
+    def _chunks(self, response: FakeResponse) -> List[FakeResponse]:
+        text = response.text
+        size = max(1, self.stream_chunk_chars)
+        chunks = [FakeResponse(text[i:i + size]) for i in range(0, len(text), size)] or [FakeResponse('')]
+        chunks[-1].usage_metadata = response.usage_metadata
+        return chunks
+
+    def render(self, contents: str, config=None) -> str:
+        """Build the full response text for a prompt"""
+        if 'Words:\n\n' in contents:
+            words = [w.strip() for w in contents.split('Words:\n\n', 1)[1].split('\n') if w.strip()]
+            if _wants_json(config):
+                return json.dumps([self.meaning_entry(w) for w in words], ensure_ascii=False)
+            return '\n'.join(self.meaning_line(w) for w in words)
+        text = contents.split('Text:\n\n', 1)[-1]
+        return ', '.join(self.important_words(text))
+
+    def important_words(self, text: str) -> List[str]:
+        """Extraction result: unique words of at least min_word_length, in text order"""
+        seen = set()
+        words = []
+        for word in WORD_PATTERN.findall(text):
+            key = word.lower()
+            if len(word) >= self.min_word_length and key not in seen:
+                seen.add(key)
+                words.append(key)
+        return words
+
+    @staticmethod
+    def meaning_entry(word: str) -> Dict[str, object]:
+        return {
+            'word': word,
+            'meanings': [f"{word}-meaning-1", f"{word}-meaning-2"],
+            'examples': [f"This sentence uses {word}.", f"Another {word} example."],
+        }
+
+    @staticmethod
+    def meaning_line(word: str) -> str:
+        return f"{word}, {word}-meaning-1; {word}-meaning-2, This sentence uses {word}. - Another {word} example."
+
+def _wants_json(config) -> bool:
+    if config is None:
+        return False
+    if isinstance(config, dict):
+        mime_type = config.get('response_mime_type')
+    else:
+        mime_type = getattr(config, 'response_mime_type', None)
+    return mime_type == 'application/json'
+
+class _FakeModel:
+    def __init__(self, name: str):
+        self.name = name
+
+class _FakeModels:
+    """Blocking API, mirrors client.models"""
+
+    def __init__(self, client: FakeGeminiClient):
+        self._client = client
+
+    def generate_content(self, model: str, contents: str, config=None) -> FakeResponse:
+        delay, error, truncate_at = self._client._begin()
+        try:
+            time.sleep(delay)
+            if error:
+                raise error
+            response = self._client._respond(contents, config, truncate_at)
+            time.sleep(self._client._generation_time(response))
+            return response
+        finally:
+            self._client._end()
+
+    def generate_content_stream(self, model: str, contents: str, config=None):
+        delay, error, truncate_at = self._client._begin()
+        try:
+            time.sleep(delay)
+            if error:
+                raise error
+            for chunk in self._client._chunks(self._client._respond(contents, config, truncate_at)):
+                time.sleep(self._client.chunk_delay)
+                yield chunk
+        finally:
+            self._client._end()
+
+    def get(self, model: str) -> _FakeModel:
+        return _FakeModel(model)
+
+class _FakeAsyncModels:
+    """Async API, mirrors client.aio.models"""
+
+    def __init__(self, client: FakeGeminiClient):
+        self._client = client
+
+    async def generate_content(self, model: str, contents: str, config=None) -> FakeResponse:
+        delay, error, truncate_at = self._client._begin()
+        try:
+            await asyncio.sleep(delay)
+            if error:
+                raise error
+            response = self._client._respond(contents, config, truncate_at)
+            await asyncio.sleep(self._client._generation_time(response))
+            return response
+        finally:
+            self._client._end()
+
+    async def generate_content_stream(self, model: str, contents: str, config=None):
+        # Like the real client, awaiting the call returns an async iterator
+        async def stream():
+            delay, error, truncate_at = self._client._begin()
+            try:
+                await asyncio.sleep(delay)
+                if error:
+                    raise error
+                for chunk in self._client._chunks(self._client._respond(contents, config, truncate_at)):
+                    await asyncio.sleep(self._client.chunk_delay)
+                    yield chunk
+            finally:
+                self._client._end()
+        return stream()
+
+    async def get(self, model: str) -> _FakeModel:
+        return _FakeModel(model)
+
+class _FakeAio:
+    def __init__(self, client: FakeGeminiClient):
+        self.models = _FakeAsyncModels(client)
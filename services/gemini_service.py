@@ -3,61 +3,241 @@ Gemini API Service
 Handles communication with Google Gemini API
 """
 
-from google import genai
-from typing import List, Dict
+from typing import Callable, Iterable, List, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
 import re
+import threading
+import time
+from collections import deque
+from processors.srt_processor import SRTProcessor
+from services.batch_sizer import AdaptiveBatchSizer, DEFAULT_MEANINGS_BATCH_SIZE
+from services.client_pool import get_client
+from services.key_scheduler import KeyScheduler, is_rate_limit_error
+from services.meanings_stream_parser import JSONArrayStreamParser, LineStreamParser
+from services.telemetry import Telemetry, get_telemetry
 from utils.settings_manager import get_settings_manager
+from utils.word_normalizer import normalize_word
+
+try:
+    # Faster JSON decoding for structured responses when available
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+GEMINI_MODEL = "gemini-2.5-flash"
+
+# Prompt budget per extraction request and number of parallel requests
+EXTRACT_CHUNK_TOKENS = 4000
+EXTRACT_MAX_WORKERS = 4
+
+# Extra attempts for a failed extraction request, and the first backoff in seconds
+EXTRACT_RETRY_ATTEMPTS = 3
+EXTRACT_RETRY_BACKOFF = 2.0
+
+# Meaning batches in flight at once
+MEANINGS_MAX_CONCURRENCY = 4
+
+# Follow-up requests for words missing from a meanings response
+MISSING_RETRY_ATTEMPTS = 2
+
+# Seconds before a meanings request is abandoned (counts as a failed batch)
+MEANINGS_REQUEST_TIMEOUT = 120.0
+
+# Rough output budget per word, used to reserve tokens per minute
+OUTPUT_TOKENS_PER_WORD = 40
+
+# Response schema for structured meanings output
+MEANINGS_RESPONSE_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "word": {"type": "STRING"},
+            "meanings": {"type": "ARRAY", "items": {"type": "STRING"}},
+            "examples": {"type": "ARRAY", "items": {"type": "STRING"}},
+        },
+        "required": ["word", "meanings", "examples"],
+    },
+}
 
 class GeminiService:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, key_scheduler: Optional[KeyScheduler] = None, meaning_cache=None,
+                 structured_output: bool = True, client_factory: Optional[Callable[[str], object]] = None,
+                 coalescer=None, telemetry: Optional[Telemetry] = None, providers=None):
+        """
+        meaning_cache: optional object with get_cached_meanings() and
+        cache_meanings() (DatabaseManager) consulted before any network call
+        structured_output: request meanings as schema-validated JSON instead
+        of comma separated lines
+        client_factory: returns the client for an API key; defaults to the
+        shared client pool (see services/fake_gemini.py for offline runs)
+        coalescer: optional MeaningCoalescer that shares in-flight words with
+        other concurrent meaning jobs
+        telemetry: where every API call is recorded (process-wide by default)
+        providers: MeaningProviders (e.g. a local dictionary) asked before
+        the cache and Gemini
+        """
+        self.structured_output = structured_output
         self.api_key = api_key
-        self.client = genai.Client(api_key=api_key)
+        self.client_factory = client_factory or get_client
+        self.client = self.client_factory(api_key)  # Shared, keeps connections alive
+        self.key_scheduler = key_scheduler
+        self.meaning_cache = meaning_cache
+        self.coalescer = coalescer
+        self.telemetry = telemetry or get_telemetry()
+        self.providers = providers or []
+        self.batch_sizer: Optional[AdaptiveBatchSizer] = None  # Loaded on first adaptive job
         self.settings = get_settings_manager()
         self.srt_lang = self.settings.get_srt_language()  # Returns: "english"
         self.translate_lang = self.settings.get_translate_language()  # Returns: "farsi"
     
-    def extract_important_words(self, text: str) -> List[str]:
-        """
-        Extract important words from text using Gemini
-        Returns list of words
-        """
+    def build_extract_prompt(self, text: str) -> str:
+        """Build the extraction prompt for one chunk of text"""
         preprompt = (
             f"Identify words in the following text that are likely useful or important "
             f"for an intermediate language learner. List the words separated by commas. "
             f"Do not include any explanations—only the words. Text:\n\n"
         )
-        
-        prompt = f"{preprompt}{text}"
-        print("prompt made test len", len(text))
+        return f"{preprompt}{text}"
+    
+    def _request_words(self, api_key: str, prompt: str, retries: int = 0):
+        """
+        Send one extraction request on an API key and record the call
+        API errors are raised
+        Returns (words, usage_metadata)
+        """
+        client = self.client if api_key == self.api_key else self.get_client_for_key(api_key)
+        started = time.monotonic()
         try:
-            response = self.client.models.generate_content(
-                model="gemini-2.5-flash",
+            response = client.models.generate_content(
+                model=GEMINI_MODEL,
                 contents=prompt
             )
-            print("response received test", response.text[:100])
             # Parse response and split by comma
             words_text = response.text.strip()
-            words = [w.strip() for w in words_text.split(',') if w.strip()]
-            
-            # Remove duplicates while preserving order
-            seen = set()
-            unique_words = []
-            for word in words:
-                word_lower = word.lower()
-                if word_lower not in seen:
-                    seen.add(word_lower)
-                    unique_words.append(word)
-            
-            return unique_words
+            words = self.dedupe_words(w.strip() for w in words_text.split(',') if w.strip())
         except Exception as e:
-            print(f"Error extracting words: {e}")
-            return []
+            self.telemetry.record('extract', GEMINI_MODEL, api_key, 1,
+                                  latency=time.monotonic() - started, retries=retries, error=e)
+            raise
+        usage = getattr(response, 'usage_metadata', None)
+        self.telemetry.record('extract', GEMINI_MODEL, api_key, 1, usage,
+                              time.monotonic() - started, retries, parsed=1 if words else 0)
+        return words, usage
     
-    def get_word_meanings(self, words: List[str]) -> Dict[str, Dict[str, str]]:
+    def extract_important_words(self, text: str) -> List[str]:
         """
-        Get meanings and examples for a list of words
-        Returns dict: {word: {'meaning': 'Persian meaning', 'examples': 'example sentences'}}
+        Extract important words from text using Gemini
+        With a key scheduler the request goes to whichever key has capacity
+        and a rate-limited key is parked; other errors are retried with
+        exponential backoff
+        Returns list of words; raises the last error once all attempts failed
         """
+        prompt = self.build_extract_prompt(text)
+        # The reply lists a subset of the text's words, so it is shorter than the prompt
+        estimated_tokens = SRTProcessor.estimate_tokens(prompt) * 2
+        
+        error = None
+        for attempt in range(EXTRACT_RETRY_ATTEMPTS + 1):
+            if attempt:
+                time.sleep(EXTRACT_RETRY_BACKOFF * 2 ** (attempt - 1))
+            api_key = self.key_scheduler.acquire(estimated_tokens) if self.key_scheduler else self.api_key
+            try:
+                words, usage = self._request_words(api_key, prompt, attempt)
+            except Exception as e:
+                error = e
+                if self.key_scheduler:
+                    self.key_scheduler.release(api_key, estimated_tokens)
+                    if is_rate_limit_error(e):
+                        self.key_scheduler.report_rate_limited(api_key)
+                print(f"Error extracting words (attempt {attempt + 1}): {e}")
+                continue
+            
+            if self.key_scheduler:
+                actual_tokens = getattr(usage, 'total_token_count', None) if usage else None
+                self.key_scheduler.release(api_key, estimated_tokens, actual_tokens)
+            return words
+        
+        raise error
+    
+    def extract_important_words_chunked(self, chunks: List[str],
+                                        max_workers: int = EXTRACT_MAX_WORKERS,
+                                        on_words: Optional[Callable[[List[str], int, int], None]] = None,
+                                        on_chunk: Optional[Callable[[int, List[str]], None]] = None) -> List[str]:
+        """
+        Extract important words from several text chunks concurrently
+        At most max_workers requests are in flight; results are merged in chunk order
+        
+        If on_words is given it is called as on_words(new_words, done, total) each
+        time a chunk finishes, with only the words not reported before. Results are
+        then merged in completion order.
+        on_chunk(index, words) is called first with every word of the finished
+        chunk, so callers can checkpoint chunk by chunk
+        
+        A chunk whose request fails is not reported; the other chunks still
+        finish, then the first error is raised
+        """
+        if not chunks:
+            return []
+        if len(chunks) == 1 and on_words is None and on_chunk is None:
+            return self.extract_important_words(chunks[0])
+        
+        workers = max(1, min(max_workers, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            if on_words is None and on_chunk is None:
+                results = list(executor.map(self.extract_important_words, chunks))
+                return self.dedupe_words(word for words in results for word in words)
+            
+            futures = {executor.submit(self.extract_important_words, chunk): i for i, chunk in enumerate(chunks)}
+            seen = set()
+            all_words = []
+            error = None
+            for done, future in enumerate(as_completed(futures), start=1):
+                try:
+                    words = future.result()
+                except Exception as e:
+                    error = error or e
+                    continue
+                if on_chunk:
+                    on_chunk(futures[future], words)
+                new_words = []
+                for word in words:
+                    word_lower = word.lower()
+                    if word_lower not in seen:
+                        seen.add(word_lower)
+                        new_words.append(word)
+                all_words.extend(new_words)
+                if on_words:
+                    on_words(new_words, done, len(chunks))
+            if error is not None:
+                raise error
+            return all_words
+    
+    @staticmethod
+    def dedupe_words(words: Iterable[str]) -> List[str]:
+        """Remove duplicates (case-insensitive) while preserving order"""
+        seen = set()
+        unique_words = []
+        for word in words:
+            word_lower = word.lower()
+            if word_lower not in seen:
+                seen.add(word_lower)
+                unique_words.append(word)
+        return unique_words
+    
+    def build_meanings_prompt(self, words: List[str]) -> str:
+        """Build the meanings prompt for a batch of words"""
+        if self.structured_output:
+            preprompt = (
+                f"Each line in the following input contains one {self.srt_lang} word. "
+                f"For each word, return an object with the word exactly as given, "
+                f"its common {self.translate_lang} meanings, and one or more example sentences "
+                f"demonstrating its usage in {self.srt_lang}. Words:\n\n"
+            )
+            words_text = '\n'.join(words)
+            return f"{preprompt}{words_text}"
+        
         # preprompt = (
         #     "Each line in the following input contains one English word. "
         #     "For each word, return its Persian meaning and one or more example sentences "
@@ -75,59 +255,524 @@ class GeminiService:
             f"Separate multiple example sentences with a hyphen (-). "
             f"Do not add any extra explanation. Words:\n\n"
         )
-        print("preprompt:", preprompt)
         words_text = '\n'.join(words)
-        prompt = f"{preprompt}{words_text}"
+        return f"{preprompt}{words_text}"
+    
+    @staticmethod
+    def parse_meanings_text(text: str) -> Dict[str, Dict[str, str]]:
+        """
+        Parse a meanings response in 'word, meaning, examples' line format
+        Returns dict: {word: {'meaning': ..., 'examples': ...}}
+        """
+        meanings_dict = {}
+        lines = text.strip().split('\n')
         
-        try:
-            response = self.client.models.generate_content(
-                model="gemini-2.5-flash",
-                contents=prompt
-            )
+        for line in lines:
+            if not line.strip():
+                continue
             
-            # Parse response
-            meanings_dict = {}
-            lines = response.text.strip().split('\n')
+            # Try to parse: word, meaning, examples
+            parts = [p.strip() for p in line.split(',', 2)]
             
-            for line in lines:
-                if not line.strip():
-                    continue
+            if len(parts) >= 3:
+                word = parts[0]
+                meaning = parts[1]
+                examples = parts[2]
                 
-                # Try to parse: word, meaning, examples
-                parts = [p.strip() for p in line.split(',', 2)]
-                
-                if len(parts) >= 3:
-                    word = parts[0]
-                    meaning = parts[1]
-                    examples = parts[2]
-                    
-                    meanings_dict[word] = {
-                        'meaning': meaning,
-                        'examples': examples
-                    }
-                elif len(parts) == 2:
-                    # If no examples provided
-                    word = parts[0]
-                    meaning = parts[1]
-                    meanings_dict[word] = {
-                        'meaning': meaning,
-                        'examples': ''
-                    }
-            
-            return meanings_dict
+                meanings_dict[word] = {
+                    'meaning': meaning,
+                    'examples': examples
+                }
+            elif len(parts) == 2:
+                # If no examples provided
+                word = parts[0]
+                meaning = parts[1]
+                meanings_dict[word] = {
+                    'meaning': meaning,
+                    'examples': ''
+                }
+        
+        return meanings_dict
+    
+    @staticmethod
+    def validate_meanings_entry(entry, index: int) -> Tuple[Optional[Tuple[str, Dict[str, str]]], Optional[str]]:
+        """
+        Validate one structured entry ({word, meanings[], examples[]})
+        Returns ((word, {'meaning': ..., 'examples': ...}), error) where
+        meanings are joined with ';' and examples with ' - ' to match the
+        line format; either part may be None
+        """
+        if not isinstance(entry, dict):
+            return None, f"Entry {index}: not an object"
+        
+        word = entry.get('word')
+        meanings = entry.get('meanings')
+        examples = entry.get('examples', [])
+        if not isinstance(word, str) or not word.strip():
+            return None, f"Entry {index}: missing word"
+        if isinstance(meanings, str):
+            meanings = [meanings]
+        if not isinstance(meanings, list) or not any(isinstance(m, str) and m.strip() for m in meanings):
+            return None, f"Entry {index} ({word}): missing meanings"
+        
+        error = None
+        if isinstance(examples, str):
+            examples = [examples]
+        if not isinstance(examples, list):
+            error = f"Entry {index} ({word}): examples is not a list"
+            examples = []
+        
+        return (word.strip(), {
+            'meaning': '; '.join(m.strip() for m in meanings if isinstance(m, str) and m.strip()),
+            'examples': ' - '.join(e.strip() for e in examples if isinstance(e, str) and e.strip())
+        }), error
+    
+    @staticmethod
+    def parse_meanings_json(text: str) -> Tuple[Dict[str, Dict[str, str]], List[str]]:
+        """
+        Parse a structured meanings response (JSON array of
+        {word, meanings[], examples[]} objects)
+        Returns (meanings_dict, errors) where each malformed entry is
+        reported separately
+        A truncated response keeps the entries that were complete
+        """
+        try:
+            entries = json_loads(text)
+        except ValueError as e:
+            parser = JSONArrayStreamParser(GeminiService.validate_meanings_entry)
+            salvaged = dict(parser.feed(text))
+            parser.close()
+            return salvaged, [f"Response is not valid JSON: {e}"] + parser.errors
+        
+        if not isinstance(entries, list):
+            return {}, ["Response is not a JSON array"]
+        
+        meanings_dict = {}
+        errors = []
+        for i, entry in enumerate(entries):
+            parsed, error = GeminiService.validate_meanings_entry(entry, i)
+            if error:
+                errors.append(error)
+            if parsed:
+                word, meaning = parsed
+                meanings_dict[word] = meaning
+        
+        return meanings_dict, errors
+    
+    def parse_meanings_response(self, text: str) -> Dict[str, Dict[str, str]]:
+        """Parse a meanings response in the active output mode"""
+        if not self.structured_output:
+            return self.parse_meanings_text(text)
+        
+        meanings_dict, errors = self.parse_meanings_json(text)
+        for error in errors:
+            print(f"Malformed meanings entry: {error}")
+        return meanings_dict
+    
+    def meanings_config(self) -> Optional[dict]:
+        """Generation config for meanings requests"""
+        if not self.structured_output:
+            return None
+        return {
+            'response_mime_type': 'application/json',
+            'response_schema': MEANINGS_RESPONSE_SCHEMA,
+        }
+    
+    def get_word_meanings(self, words: List[str]) -> Dict[str, Dict[str, str]]:
+        """
+        Get meanings and examples for a list of words
+        Returns dict: {word: {'meaning': 'Persian meaning', 'examples': 'example sentences'}}
+        """
+        prompt = self.build_meanings_prompt(words)
+        started = time.monotonic()
+        
+        try:
+            response = self.client.models.generate_content(
+                model=GEMINI_MODEL,
+                contents=prompt,
+                config=self.meanings_config()
+            )
+            meanings = self.parse_meanings_response(response.text)
+            self.telemetry.record(
+                'meanings', GEMINI_MODEL, self.api_key, len(words), getattr(response, 'usage_metadata', None),
+                time.monotonic() - started, parsed=len(meanings)
+            )
+            return meanings
         except Exception as e:
+            self.telemetry.record('meanings', GEMINI_MODEL, self.api_key, len(words),
+                                  latency=time.monotonic() - started, error=e)
             print(f"Error getting meanings: {e}")
             return {}
     
-    def get_word_meanings_batch(self, words: List[str], batch_size: int = 50) -> Dict[str, Dict[str, str]]:
+    def get_client_for_key(self, api_key: str):
+        """Get the client for another API key"""
+        return self.client_factory(api_key)
+    
+    async def _generate_async(self, client, prompt: str, config: Optional[dict] = None):
+        """Call generate_content without blocking the event loop"""
+        aio = getattr(client, 'aio', None)
+        if aio is not None:
+            return await aio.models.generate_content(
+                model=GEMINI_MODEL,
+                contents=prompt,
+                config=config
+            )
+        return await asyncio.to_thread(
+            client.models.generate_content,
+            model=GEMINI_MODEL,
+            contents=prompt,
+            config=config
+        )
+    
+    async def _aiter_in_thread(self, make_iterator):
+        """Consume a blocking iterator on a worker thread as an async iterator"""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        done = object()
+        
+        def run():
+            try:
+                for item in make_iterator():
+                    loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, (done, e))
+                return
+            loop.call_soon_threadsafe(queue.put_nowait, (done, None))
+        
+        threading.Thread(target=run, daemon=True).start()
+        while True:
+            item, error = await queue.get()
+            if item is done:
+                if error:
+                    raise error
+                return
+            yield item
+    
+    async def _stream_meanings_async(self, client, prompt: str,
+                                     on_entry: Callable[[str, Dict[str, str]], None]):
         """
-        Get meanings for words in batches to handle large lists
+        Stream a meanings response and hand each completed entry to on_entry
+        If the stream drops after some entries were parsed, those are kept
+        Returns (meanings_dict, usage_metadata)
+        """
+        config = self.meanings_config()
+        if self.structured_output:
+            parser = JSONArrayStreamParser(self.validate_meanings_entry)
+        else:
+            parser = LineStreamParser(self.parse_meanings_text)
+        
+        meanings = {}
+        usage = None
+        
+        def accept(entries):
+            for word, entry in entries:
+                meanings[word] = entry
+                on_entry(word, entry)
+        
+        try:
+            aio = getattr(client, 'aio', None)
+            if aio is not None:
+                stream = await aio.models.generate_content_stream(
+                    model=GEMINI_MODEL,
+                    contents=prompt,
+                    config=config
+                )
+            else:
+                stream = self._aiter_in_thread(lambda: client.models.generate_content_stream(
+                    model=GEMINI_MODEL,
+                    contents=prompt,
+                    config=config
+                ))
+            async for chunk in stream:
+                accept(parser.feed(chunk.text or ''))
+                usage = getattr(chunk, 'usage_metadata', None) or usage
+            accept(parser.close())
+        except Exception as e:
+            if not meanings:
+                raise
+            print(f"Meanings stream dropped after {len(meanings)} word(s): {e}")
+        
+        for error in getattr(parser, 'errors', []):
+            print(f"Malformed meanings entry: {error}")
+        return meanings, usage
+    
+    async def _request_meanings_async(self, api_key: str, words: List[str], prompt: str,
+                                      on_entry=None, retries: int = 0):
+        """
+        Request meanings for one prompt on an API key and record the call
+        API errors are raised
+        Returns (meanings_dict, usage_metadata)
+        """
+        client = self.client if api_key == self.api_key else self.get_client_for_key(api_key)
+        started = time.monotonic()
+        try:
+            if on_entry is not None:
+                meanings, usage = await self._stream_meanings_async(client, prompt, on_entry)
+            else:
+                response = await self._generate_async(client, prompt, self.meanings_config())
+                meanings = self.parse_meanings_response(response.text)
+                usage = getattr(response, 'usage_metadata', None)
+        except (Exception, asyncio.CancelledError) as e:
+            # CancelledError is not an Exception: it is how a request that
+            # hit MEANINGS_REQUEST_TIMEOUT ends, and it must be recorded too
+            self.telemetry.record('meanings', GEMINI_MODEL, api_key, len(words),
+                                  latency=time.monotonic() - started, retries=retries, error=e)
+            raise
+        self.telemetry.record('meanings', GEMINI_MODEL, api_key, len(words), usage,
+                              time.monotonic() - started, retries, parsed=len(meanings))
+        return meanings, usage
+    
+    async def get_word_meanings_async(self, words: List[str], on_entry=None,
+                                      retries: int = 0) -> Dict[str, Dict[str, str]]:
+        """
+        Async variant of get_word_meanings
+        Uses the client's native async API when available
+        With on_entry(word, entry), the response is streamed and each word is
+        reported as soon as its line/object is complete
+        retries: how many times these words were requested before (telemetry)
+        """
+        prompt = self.build_meanings_prompt(words)
+        
+        try:
+            meanings, _ = await self._request_meanings_async(self.api_key, words, prompt, on_entry, retries)
+            return meanings
+        except Exception as e:
+            print(f"Error getting meanings: {e}")
+            return {}
+    
+    async def get_word_meanings_scheduled(self, words: List[str], on_entry=None,
+                                          retries: int = 0) -> Dict[str, Dict[str, str]]:
+        """
+        Get meanings for one batch on whichever key the scheduler picks
+        A rate-limited key is parked and the batch is retried on another key
+        """
+        prompt = self.build_meanings_prompt(words)
+        estimated_tokens = SRTProcessor.estimate_tokens(prompt) + OUTPUT_TOKENS_PER_WORD * len(words)
+        
+        for attempt in range(self.key_scheduler.key_count() + 1):
+            api_key = await self.key_scheduler.acquire_async(estimated_tokens)
+            try:
+                meanings, usage = await self._request_meanings_async(
+                    api_key, words, prompt, on_entry, retries + attempt
+                )
+            except asyncio.CancelledError:
+                self.key_scheduler.release(api_key, estimated_tokens)
+                raise
+            except Exception as e:
+                self.key_scheduler.release(api_key, estimated_tokens)
+                if is_rate_limit_error(e):
+                    self.key_scheduler.report_rate_limited(api_key)
+                    continue
+                print(f"Error getting meanings: {e}")
+                return {}
+            
+            actual_tokens = getattr(usage, 'total_token_count', None) if usage else None
+            self.key_scheduler.release(api_key, estimated_tokens, actual_tokens)
+            return meanings
+        
+        print("Error getting meanings: all API keys are rate limited")
+        return {}
+    
+    def get_batch_sizer(self) -> AdaptiveBatchSizer:
+        """Batch sizer starting from the size learned for this model and language pair"""
+        if self.batch_sizer is None:
+            learned = self.settings.get_meanings_batch_size(GEMINI_MODEL, self.srt_lang, self.translate_lang)
+            self.batch_sizer = AdaptiveBatchSizer(learned or DEFAULT_MEANINGS_BATCH_SIZE)
+        return self.batch_sizer
+    
+    def save_batch_size(self):
+        """Persist the learned batch size so the next session starts near it"""
+        if self.batch_sizer is not None:
+            self.settings.set_meanings_batch_size(
+                GEMINI_MODEL, self.srt_lang, self.translate_lang, self.batch_sizer.size
+            )
+    
+    async def get_word_meanings_batch_async(self, words: List[str], batch_size: Optional[int] = None,
+                                            max_concurrency: int = MEANINGS_MAX_CONCURRENCY,
+                                            on_word: Optional[Callable[[str, Dict[str, str]], None]] = None,
+                                            on_progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Dict[str, str]]:
         """
+        Get meanings for words with up to max_concurrency batches in flight
+        Results are merged as batches complete
+        With a key scheduler, batches are spread over all keys and
+        max_concurrency applies per key
+        
+        batch_size=None sizes batches adaptively: each batch is cut from the
+        remaining words when it is sent, using the size the batch sizer has
+        learned from the batches before it
+        
+        If on_word(word, entry) or on_progress(done, total) is given, responses
+        are streamed and every word is reported once, as soon as it is parsed
+        """
+        if self.key_scheduler:
+            max_concurrency *= max(1, self.key_scheduler.key_count())
+            fetch_batch = self.get_word_meanings_scheduled
+        else:
+            fetch_batch = self.get_word_meanings_async
+        
+        sizer = self.get_batch_sizer() if batch_size is None else None
+        streaming = on_word is not None or on_progress is not None
+        total = len(words)
+        reported = [0]
+        
+        def report(word, entry):
+            reported[0] += 1
+            if on_word:
+                on_word(word, entry)
+            if on_progress:
+                on_progress(reported[0], total)
+        
+        async def fetch(batch, retries_left=MISSING_RETRY_ATTEMPTS):
+            # Key results by the requested spelling, folding case and punctuation
+            by_norm = {normalize_word(w): w for w in batch}
+            found = {}
+            
+            def accept(raw_word, entry):
+                word = by_norm.get(normalize_word(raw_word))
+                if word is not None and word not in found:
+                    found[word] = entry
+                    if streaming:
+                        report(word, entry)
+            
+            started = time.monotonic()
+            timed_out = False
+            try:
+                result = await asyncio.wait_for(
+                    fetch_batch(batch, accept if streaming else None, MISSING_RETRY_ATTEMPTS - retries_left),
+                    MEANINGS_REQUEST_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                print(f"Meanings request for {len(batch)} word(s) timed out")
+                result = {}
+                timed_out = True
+            for raw_word, entry in result.items():
+                accept(raw_word, entry)
+            # Only first attempts tell how large a batch can be; a retry holds
+            # just the words the model left out, often words it cannot answer
+            if sizer and retries_left == MISSING_RETRY_ATTEMPTS:
+                sizer.record(len(batch), len(found), time.monotonic() - started, timed_out)
+            
+            # Re-request only the words the response left out, split to the
+            # (possibly reduced) batch size
+            missing = [w for w in batch if w not in found]
+            if missing and retries_left:
+                print(f"Retrying {len(missing)} word(s) missing from response")
+                size = sizer.size if sizer else len(missing)
+                for i in range(0, len(missing), size):
+                    found.update(await fetch(missing[i:i + size], retries_left - 1))
+            return found
+        
+        remaining = deque(words)
         all_meanings = {}
         
-        for i in range(0, len(words), batch_size):
-            batch = words[i:i + batch_size]
-            batch_meanings = self.get_word_meanings(batch)
-            all_meanings.update(batch_meanings)
+        async def worker():
+            while remaining:
+                size = sizer.size if sizer else batch_size
+                batch = [remaining.popleft() for _ in range(min(size, len(remaining)))]
+                all_meanings.update(await fetch(batch))
         
-        return all_meanings
\ No newline at end of file
+        try:
+            await asyncio.gather(*(worker() for _ in range(max(1, max_concurrency))))
+        finally:
+            if sizer:
+                self.save_batch_size()
+        
+        return all_meanings
+    
+    def get_word_meanings_batch(self, words: List[str], batch_size: Optional[int] = None,
+                                max_concurrency: int = MEANINGS_MAX_CONCURRENCY,
+                                on_word: Optional[Callable[[str, Dict[str, str]], None]] = None,
+                                on_progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Dict[str, str]]:
+        """
+        Get meanings for words in batches to handle large lists
+        batch_size=None lets the adaptive batch sizer pick the size
+        Local providers (e.g. an offline dictionary) are asked first, then the
+        meaning cache, and only the remaining words go to the API
+        Batches run concurrently on a private event loop, so this must be
+        called from a background thread (not from inside a running loop)
+        
+        on_word(word, entry) acts as a persistence sink and on_progress(done, total)
+        as a progress callback; both are called from the worker thread as words
+        arrive, so work completed before a crash or cancellation is kept
+        """
+        if not self.providers and self.meaning_cache is None:
+            return self.fetch_missing_meanings(words, batch_size, max_concurrency, on_word, on_progress)
+        
+        local = {}
+        for provider in self.providers:
+            remaining = [w for w in words if w not in local]
+            if not remaining:
+                break
+            hits = provider.lookup(remaining, self.srt_lang, self.translate_lang)
+            print(f"Meanings from {provider.name}: {len(hits)} of {len(remaining)}")
+            local.update(hits)
+        
+        if self.meaning_cache is not None:
+            remaining = [w for w in words if w not in local]
+            cached = self.meaning_cache.get_cached_meanings(remaining, self.srt_lang, self.translate_lang)
+            print(f"Meaning cache: {len(cached)} hits, {len(remaining) - len(cached)} misses")
+            local.update(cached)
+        
+        misses = [w for w in words if w not in local]
+        total = len(words)
+        for done, (word, entry) in enumerate(local.items(), start=1):
+            if on_word:
+                on_word(word, entry)
+            if on_progress:
+                on_progress(done, total)
+        
+        streaming = on_word is not None or on_progress is not None
+        fetched = {}
+        
+        def collect(word, entry):
+            fetched[word] = entry
+            if on_word:
+                on_word(word, entry)
+        
+        def progress(done, _):
+            if on_progress:
+                on_progress(len(local) + done, total)
+        
+        try:
+            if misses:
+                fetched.update(self.fetch_missing_meanings(
+                    misses, batch_size, max_concurrency,
+                    collect if streaming else None,
+                    progress if streaming else None
+                ))
+        finally:
+            # Cache whatever arrived, even if the job was interrupted
+            if fetched and self.meaning_cache is not None:
+                self.meaning_cache.cache_meanings(fetched, self.srt_lang, self.translate_lang, GEMINI_MODEL)
+        
+        fetched.update(local)
+        return fetched
+    
+    def fetch_missing_meanings(self, words: List[str], batch_size: Optional[int] = None,
+                               max_concurrency: int = MEANINGS_MAX_CONCURRENCY,
+                               on_word=None, on_progress=None) -> Dict[str, Dict[str, str]]:
+        """
+        Fetch meanings for words that are not cached
+        With a coalescer, words already being fetched by another job are
+        waited for instead of requested again
+        """
+        if self.coalescer is None or not words:
+            return self.fetch_word_meanings_batch(words, batch_size, max_concurrency, on_word, on_progress)
+        return self.coalescer.get_meanings(
+            words, self.srt_lang, self.translate_lang,
+            lambda merged, resolve: self.fetch_word_meanings_batch(merged, batch_size, max_concurrency, resolve),
+            on_word, on_progress
+        )
+    
+    def fetch_word_meanings_batch(self, words: List[str], batch_size: Optional[int] = None,
+                                  max_concurrency: int = MEANINGS_MAX_CONCURRENCY,
+                                  on_word=None, on_progress=None) -> Dict[str, Dict[str, str]]:
+        """
+        Fetch meanings for words from the API, bypassing the cache
+        Returns dict keyed by the requested spelling of each word
+        """
+        if not words:
+            return {}
+        return asyncio.run(self.get_word_meanings_batch_async(
+            words, batch_size, max_concurrency, on_word, on_progress
+        ))
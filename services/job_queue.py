@@ -0,0 +1,203 @@
+"""
+Job Queue
+Durable background jobs stored in the jobs table of DatabaseManager
+
+A job keeps its inputs (payload) and a checkpoint per completed step, so a
+job interrupted by closing the app or a crash is resumed from its last
+checkpoint on the next launch instead of starting over. Jobs are run by a
+small pool of worker threads; listeners are told about progress.
+"""
+
+import queue
+import threading
+import traceback
+from typing import Callable, Dict, List, Optional, Tuple
+
+JOB_WORKERS = 2
+
+# Job statuses
+JOB_PENDING = 'pending'
+JOB_RUNNING = 'running'
+JOB_REVIEW = 'review'  # Finished, results wait for the user (e.g. extracted words)
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+UNFINISHED_STATUSES = (JOB_PENDING, JOB_RUNNING)
+
+# listener(job, event, data) is called from a worker thread
+# Events: 'progress', 'words', 'finished' and 'failed'
+JobListener = Callable[[dict, str, dict], None]
+
+class JobContext:
+    """What a job handler gets: its job, the database and a way to report progress"""
+
+    def __init__(self, job_queue: 'JobQueue', job: dict):
+        self.job = job
+        self.db = job_queue.db
+        self._queue = job_queue
+
+    @property
+    def id(self) -> int:
+        return self.job['id']
+
+    @property
+    def payload(self) -> dict:
+        return self.job['payload']
+
+    @property
+    def srtfile_id(self) -> Optional[int]:
+        return self.job['srtfile']
+
+    def get_checkpoints(self) -> list:
+        """Steps completed by earlier runs of this job"""
+        return self.db.get_job_checkpoints(self.id)
+
+    def checkpoint(self, data):
+        self.db.add_job_checkpoint(self.id, data)
+
+    def update_payload(self, **changes):
+        """Store inputs derived on the first run so a resumed run reuses them"""
+        self.job['payload'].update(changes)
+        self.db.update_job(self.id, payload=self.job['payload'])
+
+    def set_srtfile(self, srtfile_id: int):
+        self.job['srtfile'] = srtfile_id
+        self.db.update_job(self.id, srtfile_id=srtfile_id)
+
+    def emit(self, event: str, **data):
+        self._queue.emit(self.job, event, data)
+
+class JobQueue:
+    def __init__(self, db, max_workers: int = JOB_WORKERS):
+        self.db = db
+        self.max_workers = max_workers
+        self._handlers: Dict[str, Tuple[Callable[[JobContext], Optional[dict]], str]] = {}
+        self._listeners: List[JobListener] = []
+        self._queue = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+
+    def register(self, kind: str, handler: Callable[[JobContext], Optional[dict]],
+                 final_status: str = JOB_DONE):
+        """
+        Register the handler for a job kind
+        handler(ctx) returns a result dict for the 'finished' event; jobs
+        whose results still need the user finish in JOB_REVIEW
+        """
+        self._handlers[kind] = (handler, final_status)
+
+    def add_listener(self, listener: JobListener):
+        self._listeners.append(listener)
+
+    def emit(self, job: dict, event: str, data: dict):
+        for listener in self._listeners:
+            try:
+                listener(job, event, data)
+            except Exception as e:
+                print(f"Job listener error: {e}")
+
+    def start(self):
+        """Start the worker threads"""
+        if self._threads:
+            return
+        self._stopping.clear()
+        for i in range(max(1, self.max_workers)):
+            thread = threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """
+        Stop taking new jobs
+        Running jobs are not waited for; they stay 'running' in the database
+        and resume on the next launch
+        """
+        self._stopping.set()
+        for _ in self._threads:
+            self._queue.put(None)
+        self._threads = []
+
+    def create(self, kind: str, payload: dict, srtfile_id: Optional[int] = None) -> int:
+        """
+        Store a new job without running it; returns the job ID
+        Lets the caller remember the ID before enqueue(), so no event of
+        the job can arrive for an ID it does not know yet
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+        return self.db.create_job(kind, payload, srtfile_id)
+
+    def enqueue(self, job_id: int):
+        """Queue a created job for the workers"""
+        self._queue.put(job_id)
+
+    def submit(self, kind: str, payload: dict, srtfile_id: Optional[int] = None) -> int:
+        """Store a new job and queue it; returns the job ID"""
+        job_id = self.create(kind, payload, srtfile_id)
+        self.enqueue(job_id)
+        return job_id
+
+    def resume_unfinished(self) -> List[int]:
+        """Queue every job left pending or running by an earlier session"""
+        job_ids = [job['id'] for job in self.db.get_jobs(UNFINISHED_STATUSES)
+                   if job['kind'] in self._handlers]
+        for job_id in job_ids:
+            self._queue.put(job_id)
+        return job_ids
+
+    def retry(self, job_id: int) -> bool:
+        """
+        Queue a failed job again; it resumes from its checkpoints
+        Returns False if the job is not in the failed state
+        """
+        job = self.db.get_job(job_id)
+        if job is None or job['status'] != JOB_FAILED:
+            return False
+        self.db.update_job(job_id, status=JOB_PENDING)
+        self._queue.put(job_id)
+        return True
+
+    def get_review_job(self, kind: str) -> Optional[dict]:
+        """Get the newest job of a kind whose results wait for the user"""
+        jobs = self.db.get_jobs([JOB_REVIEW], kind)
+        return jobs[-1] if jobs else None
+
+    def finish_review(self, job_id: Optional[int]):
+        """Mark a reviewed job done and drop its checkpoints"""
+        if job_id is None:
+            return
+        self.db.update_job(job_id, status=JOB_DONE)
+        self.db.delete_job_checkpoints(job_id)
+
+    def _worker(self):
+        while not self._stopping.is_set():
+            job_id = self._queue.get()
+            if job_id is None:
+                break
+            self._run(job_id)
+
+    def _run(self, job_id: int):
+        job = self.db.get_job(job_id)
+        if job is None or job['status'] not in UNFINISHED_STATUSES:
+            return
+        handler, final_status = self._handlers[job['kind']]
+        self.db.update_job(job_id, status=JOB_RUNNING)
+        job['status'] = JOB_RUNNING
+
+        try:
+            result = handler(JobContext(self, job)) or {}
+        except Exception as e:
+            if self._stopping.is_set():
+                return  # Interrupted by shutdown; resumed on the next launch
+            print(f"Job {job_id} ({job['kind']}) failed: {e}")
+            traceback.print_exc()
+            self.db.update_job(job_id, status=JOB_FAILED, error=str(e))
+            job['status'] = JOB_FAILED
+            self.emit(job, 'failed', {'error': str(e)})
+            return
+
+        self.db.update_job(job_id, status=final_status)
+        if final_status == JOB_DONE:
+            self.db.delete_job_checkpoints(job_id)
+        job['status'] = final_status
+        self.emit(job, 'finished', result)
@@ -0,0 +1,219 @@
+"""
+Jobs
+Handlers for the long-running work started from the screens, run by JobQueue
+
+- extract: parse an SRT file and extract important words chunk by chunk
+  (one checkpoint per chunk); finishes in review until the user fetches meanings,
+  or fails if a chunk still fails after its retries (see JobQueue.retry)
+- meanings: fetch meanings for reviewed words and save them to the words table
+- recheck: fetch meanings again for library words that have none
+
+Meaning jobs save words together with their checkpoint, so a resumed job
+only asks for the words that were not saved yet.
+"""
+
+from typing import List, Optional
+import os
+from processors.srt_processor import SRTProcessor
+from processors.candidate_filter import CandidateFilter
+from processors.frequency_table import get_common_words
+from services.gemini_service import GeminiService, EXTRACT_CHUNK_TOKENS
+from services.key_scheduler import get_key_scheduler
+from services.dictionary_provider import get_meaning_providers
+from services.meaning_coalescer import get_meaning_coalescer
+from services.job_queue import JobContext, JobQueue, JOB_REVIEW
+from utils.settings_manager import get_settings_manager
+
+MEANINGS_SAVE_EVERY = 20  # Words per database write (and checkpoint)
+
+MEANING_NOT_FOUND = "Meaning not found"
+
+def get_excluded_words(db) -> set:
+    """Known words plus the configured number of common words (all lower-case)"""
+    settings = get_settings_manager()
+    common_words = get_common_words(settings.get_srt_language(), settings.get_common_words_threshold())
+    return set(db.get_all_known_words()) | common_words
+
+def get_review_words(db, job: dict) -> List[str]:
+    """Words extracted so far by an extract job that are still unknown"""
+    words = GeminiService.dedupe_words(
+        word for checkpoint in db.get_job_checkpoints(job['id']) for word in checkpoint['words']
+    )
+    return SRTProcessor.filter_known_words(words, get_excluded_words(db))
+
+def _require_api_key() -> str:
+    api_key = get_settings_manager().get_next_api_key()
+    if not api_key:
+        raise Exception("No API key configured")
+    return api_key
+
+def get_meaning_service(db) -> GeminiService:
+    """GeminiService asking dictionaries and the cache first, then all API keys"""
+    return GeminiService(
+        _require_api_key(),
+        key_scheduler=get_key_scheduler(),
+        meaning_cache=db,
+        coalescer=get_meaning_coalescer(),
+        providers=get_meaning_providers()
+    )
+
+def format_meaning(entry: dict) -> str:
+    return f"{entry['meaning']} | Examples: {entry['examples']}"
+
+def run_extract_job(ctx: JobContext) -> dict:
+    """
+    Extract words from payload['file_path']
+    The prompt chunks are stored in the payload on the first run, so a resumed
+    job sends exactly the chunks that had not finished
+    """
+    db = ctx.db
+    settings = get_settings_manager()
+    processor = SRTProcessor()
+
+    if ctx.srtfile_id is None:
+        ctx.set_srtfile(db.add_srt_file(os.path.basename(ctx.payload['file_path'])))
+
+    if 'chunks' not in ctx.payload:
+        lines = processor.clean_srt(ctx.payload['file_path'])
+        if not lines:
+            raise Exception("No text found in SRT file")
+
+        # Keep a few unique sentences per unknown candidate word; sentences
+        # with only known words, stop words or numerals are dropped
+        candidate_filter = CandidateFilter(get_excluded_words(db), settings.get_srt_language())
+        lines, report = candidate_filter.compact(lines)
+        print(report.summary())
+
+        # Split into token-budgeted chunks on sentence boundaries
+        ctx.update_payload(chunks=processor.chunk_lines(lines, EXTRACT_CHUNK_TOKENS) if lines else [])
+
+    chunks = ctx.payload['chunks']
+    if not chunks:
+        return {'extracted': 0, 'all_known': True}
+
+    excluded = get_excluded_words(db)
+    finished = {checkpoint['chunk']: checkpoint['words'] for checkpoint in ctx.get_checkpoints()}
+    seen = set()
+    counts = {'extracted': 0, 'shown': 0}
+
+    def report_words(words):
+        new_words = [w for w in words if w.lower() not in seen]
+        seen.update(w.lower() for w in new_words)
+        counts['extracted'] += len(new_words)
+        filtered_words = processor.filter_known_words(new_words, excluded)
+        if filtered_words:
+            counts['shown'] += len(filtered_words)
+            ctx.emit('words', words=filtered_words)
+
+    # Words of chunks finished before an interruption are shown again first
+    for index in sorted(finished):
+        report_words(finished[index])
+    ctx.emit('progress', done=len(finished), total=len(chunks))
+
+    remaining = [i for i in range(len(chunks)) if i not in finished]
+
+    def on_chunk(position, words):
+        ctx.checkpoint({'chunk': remaining[position], 'words': words})
+        report_words(words)
+
+    def on_words(_, done, total):
+        ctx.emit('progress', done=len(finished) + done, total=len(chunks))
+
+    if remaining:
+        gemini = GeminiService(_require_api_key(), key_scheduler=get_key_scheduler())
+        try:
+            gemini.extract_important_words_chunked(
+                [chunks[i] for i in remaining], on_words=on_words, on_chunk=on_chunk
+            )
+        except Exception as e:
+            # Only finished chunks were checkpointed, so retrying the job
+            # requests just the chunks that failed
+            missing = len(chunks) - len({checkpoint['chunk'] for checkpoint in ctx.get_checkpoints()})
+            raise Exception(f"{missing} of {len(chunks)} parts could not be extracted: {e}") from e
+
+    if not counts['extracted']:
+        raise Exception("No words extracted from text")
+
+    # Every extracted word was filtered out as known
+    return {'extracted': counts['extracted'], 'all_known': counts['shown'] == 0}
+
+def run_meanings_job(ctx: JobContext) -> dict:
+    """Fetch and save meanings for payload['words'] of the job's SRT file"""
+    db = ctx.db
+    words = ctx.payload['words']
+    srt_id = ctx.srtfile_id
+    saved = {w for checkpoint in ctx.get_checkpoints() for w in checkpoint}
+    remaining = [w for w in words if w not in saved]
+    already_saved = len(words) - len(remaining)
+    pending = []
+
+    def flush():
+        if pending:
+            db.save_job_words(ctx.id, pending, [word for word, _, _ in pending])
+            pending.clear()
+
+    def on_word(word, entry):
+        if word in saved:
+            return
+        pending.append((word, format_meaning(entry), srt_id))
+        saved.add(word)
+        if len(pending) >= MEANINGS_SAVE_EVERY:
+            flush()
+
+    def on_progress(done, total):
+        ctx.emit('progress', done=already_saved + done, total=len(words))
+
+    if remaining:
+        gemini = get_meaning_service(db)
+        try:
+            gemini.get_word_meanings_batch(remaining, on_word=on_word, on_progress=on_progress)
+        finally:
+            flush()
+
+    # Save words the model had no meaning for
+    words_data = [(word, MEANING_NOT_FOUND, srt_id) for word in remaining if word not in saved]
+    if words_data:
+        db.save_job_words(ctx.id, words_data, [word for word, _, _ in words_data])
+    return {'saved': len(words)}
+
+def run_recheck_job(ctx: JobContext) -> dict:
+    """Fetch meanings again for payload['words'] and update them in place"""
+    db = ctx.db
+    words = ctx.payload['words']
+    srt_id = ctx.srtfile_id
+    updated = {w for checkpoint in ctx.get_checkpoints() for w in checkpoint}
+    remaining = [w for w in words if w not in updated]
+    already_updated = len(words) - len(remaining)
+    pending = []
+
+    def flush():
+        if pending:
+            db.update_job_meanings(ctx.id, pending, [word for _, word, _ in pending])
+            pending.clear()
+
+    def on_word(word, entry):
+        if word in updated:
+            return
+        pending.append((format_meaning(entry), word, srt_id))
+        updated.add(word)
+        if len(pending) >= MEANINGS_SAVE_EVERY:
+            flush()
+
+    def on_progress(done, total):
+        ctx.emit('progress', done=already_updated + done, total=len(words))
+
+    if remaining:
+        gemini = get_meaning_service(db)
+        try:
+            gemini.get_word_meanings_batch(remaining, on_word=on_word, on_progress=on_progress)
+        finally:
+            flush()
+    return {'updated': len(updated)}
+
+def create_job_queue(db, max_workers: Optional[int] = None) -> JobQueue:
+    """JobQueue with the extract, meanings and recheck handlers registered"""
+    job_queue = JobQueue(db) if max_workers is None else JobQueue(db, max_workers)
+    job_queue.register('extract', run_extract_job, final_status=JOB_REVIEW)
+    job_queue.register('meanings', run_meanings_job)
+    job_queue.register('recheck', run_recheck_job)
+    return job_queue
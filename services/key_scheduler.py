@@ -0,0 +1,166 @@
+"""
+Key Scheduler
+Spreads the batches of one job across all configured API keys
+Each key has token buckets for requests per minute and tokens per minute,
+and work is routed to whichever key has capacity
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from utils.settings_manager import get_settings_manager
+
+class TokenBucket:
+    """Continuously refilling bucket holding up to `capacity` units per minute"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0  # Units per second
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` units are available (0 if available now)"""
+        self._refill(now)
+        amount = min(amount, self.capacity)  # Oversized requests wait for a full bucket
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float, now: float):
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+
+class KeyState:
+    def __init__(self, api_key: str, requests_per_minute: int, tokens_per_minute: int):
+        self.api_key = api_key
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.blocked_until = 0.0  # Set after a 429 response
+        self.in_flight = 0
+
+    def wait_time(self, estimated_tokens: int, now: float) -> float:
+        return max(
+            self.blocked_until - now,
+            self.requests.wait_time(1, now),
+            self.tokens.wait_time(estimated_tokens, now)
+        )
+
+class KeyScheduler:
+    def __init__(self, api_keys: List[str], requests_per_minute: int, tokens_per_minute: int,
+                 rate_limit_cooldown: float = 30.0):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.rate_limit_cooldown = rate_limit_cooldown  # Seconds a key is parked after a 429
+        self._lock = threading.Lock()
+        self._keys: Dict[str, KeyState] = {}
+        self.update_keys(api_keys)
+
+    def update_keys(self, api_keys: List[str]):
+        """Sync scheduled keys with settings, keeping bucket state of existing keys"""
+        with self._lock:
+            self._keys = {
+                key: self._keys.get(key) or KeyState(key, self.requests_per_minute, self.tokens_per_minute)
+                for key in api_keys
+            }
+
+    def key_count(self) -> int:
+        return len(self._keys)
+
+    def try_acquire(self, estimated_tokens: int) -> Tuple[Optional[str], float]:
+        """
+        Reserve capacity on the best available key
+        Returns (api_key, 0) on success or (None, seconds_to_wait)
+        """
+        with self._lock:
+            if not self._keys:
+                raise ValueError("No API keys configured")
+
+            now = time.monotonic()
+            best = None
+            shortest_wait = None
+            for state in self._keys.values():
+                wait = state.wait_time(estimated_tokens, now)
+                if wait <= 0:
+                    # Prefer the key with most request capacity left, then least busy
+                    if best is None or (state.requests.tokens, -state.in_flight) > (best.requests.tokens, -best.in_flight):
+                        best = state
+                elif shortest_wait is None or wait < shortest_wait:
+                    shortest_wait = wait
+
+            if best is None:
+                return None, shortest_wait
+
+            best.requests.consume(1, now)
+            best.tokens.consume(estimated_tokens, now)
+            best.in_flight += 1
+            return best.api_key, 0.0
+
+    def acquire(self, estimated_tokens: int) -> str:
+        """Block the calling thread until a key has capacity"""
+        while True:
+            key, wait = self.try_acquire(estimated_tokens)
+            if key:
+                return key
+            time.sleep(min(wait, 1.0))
+
+    async def acquire_async(self, estimated_tokens: int) -> str:
+        """Wait (without blocking the event loop) until a key has capacity"""
+        while True:
+            key, wait = self.try_acquire(estimated_tokens)
+            if key:
+                return key
+            await asyncio.sleep(min(wait, 1.0))
+
+    def release(self, api_key: str, estimated_tokens: int = 0, actual_tokens: Optional[int] = None):
+        """Finish a request, correcting the token bucket with actual usage if known"""
+        with self._lock:
+            state = self._keys.get(api_key)
+            if not state:
+                return
+            state.in_flight = max(0, state.in_flight - 1)
+            if actual_tokens is not None and actual_tokens != estimated_tokens:
+                state.tokens.consume(actual_tokens - estimated_tokens, time.monotonic())
+
+    def report_rate_limited(self, api_key: str, retry_after: Optional[float] = None):
+        """Stop routing work to a key that returned 429 for a while"""
+        if retry_after is None:
+            retry_after = self.rate_limit_cooldown
+        with self._lock:
+            state = self._keys.get(api_key)
+            if state:
+                state.blocked_until = time.monotonic() + retry_after
+                state.requests.tokens = 0.0
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Check if an API error is a 429 / quota exhaustion"""
+    text = str(error)
+    return '429' in text or 'RESOURCE_EXHAUSTED' in text
+
+# Singleton instance
+_key_scheduler_instance = None
+_key_scheduler_lock = threading.Lock()
+
+def get_key_scheduler() -> KeyScheduler:
+    """
+    Get process-wide KeyScheduler synced with the configured API keys
+
+    Usage:
+        from services.key_scheduler import get_key_scheduler
+
+        gemini = GeminiService(api_key, key_scheduler=get_key_scheduler())
+    """
+    global _key_scheduler_instance
+    settings = get_settings_manager()
+    with _key_scheduler_lock:
+        if _key_scheduler_instance is None:
+            rpm, tpm = settings.get_key_rate_limits()
+            _key_scheduler_instance = KeyScheduler(settings.get_api_keys(), rpm, tpm)
+        else:
+            _key_scheduler_instance.update_keys(settings.get_api_keys())
+    return _key_scheduler_instance
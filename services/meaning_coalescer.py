@@ -0,0 +1,139 @@
+"""
+Meaning Coalescer
+Single-flight layer in front of GeminiService for concurrent meaning jobs
+(e.g. a library recheck and a fresh "Fetch Meanings" running together)
+
+Each word being fetched has one future per language pair. A caller asking
+for a word that is already in flight waits on that future instead of paying
+for it again. New words from different callers that arrive within a short
+window are merged into one fetch.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+from utils.word_normalizer import normalize_word
+
+# Seconds new words wait for other callers before their fetch starts
+MERGE_WINDOW_SECONDS = 0.1
+
+Entry = Dict[str, str]
+# fetch(words, on_word) fetches meanings and calls on_word(word, entry) as they arrive
+FetchFunction = Callable[[List[str], Callable[[str, Entry], None]], object]
+
+class MeaningCoalescer:
+    def __init__(self, merge_window: float = MERGE_WINDOW_SECONDS):
+        self.merge_window = merge_window
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple[str, str, str], Future] = {}
+        self._pending: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}  # Pair -> [(norm, word)]
+
+    def get_meanings(self, words: List[str], srt_language: str, translate_language: str,
+                     fetch: FetchFunction,
+                     on_word: Optional[Callable[[str, Entry], None]] = None,
+                     on_progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Entry]:
+        """
+        Get meanings for words, sharing requests with concurrent callers
+        fetch is only used if this caller starts a new merged request
+        on_word / on_progress are called on the calling thread as words complete
+        Returns dict keyed by the requested spelling (missing words are left out)
+        """
+        pair = (srt_language.lower(), translate_language.lower())
+        futures: Dict[str, Future] = {}
+        start_collector = False
+
+        with self._lock:
+            for word in words:
+                norm = normalize_word(word)
+                if not norm or word in futures:
+                    continue
+                key = (norm,) + pair
+                future = self._inflight.get(key)
+                if future is None:
+                    future = Future()
+                    self._inflight[key] = future
+                    pending = self._pending.setdefault(pair, [])
+                    # Pending words mean a collector is already waiting for this pair
+                    start_collector = start_collector or not pending
+                    pending.append((norm, word))
+                futures[word] = future
+
+        if start_collector:
+            threading.Thread(target=self._collect, args=(pair, fetch), daemon=True).start()
+
+        # Completed futures are handed over to this thread through a queue
+        completed = queue.Queue()
+        for word, future in futures.items():
+            future.add_done_callback(lambda f, word=word: completed.put((word, f)))
+
+        meanings = {}
+        for done in range(1, len(futures) + 1):
+            word, future = completed.get()
+            try:
+                entry = future.result()
+            except Exception as e:
+                print(f"Error getting meaning for '{word}': {e}")
+                entry = None
+            if entry is not None:
+                meanings[word] = entry
+                if on_word:
+                    on_word(word, entry)
+            if on_progress:
+                on_progress(done, len(futures))
+        return meanings
+
+    def _collect(self, pair: Tuple[str, str], fetch: FetchFunction):
+        """Wait for the merge window, then fetch every pending word of the pair at once"""
+        time.sleep(self.merge_window)
+        with self._lock:
+            batch = self._pending.pop(pair, [])
+            futures = {norm: self._inflight[(norm,) + pair] for norm, _ in batch}
+        if not batch:
+            return
+
+        def resolve(word, entry):
+            future = futures.get(normalize_word(word))
+            if future is not None and not future.done():
+                self._finish(future, pair, normalize_word(word), entry)
+
+        error = None
+        try:
+            fetch([word for _, word in batch], resolve)
+        except Exception as e:
+            error = e
+        finally:
+            # Words the fetch did not return are reported missing to every waiter
+            for norm, future in futures.items():
+                if not future.done():
+                    self._finish(future, pair, norm, None, error)
+
+    def _finish(self, future: Future, pair: Tuple[str, str], norm: str,
+                entry: Optional[Entry], error: Optional[Exception] = None):
+        with self._lock:
+            if self._inflight.get((norm,) + pair) is future:
+                del self._inflight[(norm,) + pair]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(entry)
+
+# Singleton instance
+_meaning_coalescer_instance = None
+_meaning_coalescer_lock = threading.Lock()
+
+def get_meaning_coalescer() -> MeaningCoalescer:
+    """
+    Get process-wide MeaningCoalescer shared by all screens
+
+    Usage:
+        from services.meaning_coalescer import get_meaning_coalescer
+
+        gemini = GeminiService(api_key, coalescer=get_meaning_coalescer())
+    """
+    global _meaning_coalescer_instance
+    with _meaning_coalescer_lock:
+        if _meaning_coalescer_instance is None:
+            _meaning_coalescer_instance = MeaningCoalescer()
+    return _meaning_coalescer_instance
@@ -0,0 +1,92 @@
+"""
+Meanings Stream Parser
+Parses meanings responses incrementally while chunks are still arriving
+Complete entries are returned as soon as they are available, so a dropped
+stream keeps everything parsed up to that point
+"""
+
+import json
+from typing import Callable, Dict, List, Optional, Tuple
+
+Entry = Tuple[str, Dict[str, str]]
+
+class LineStreamParser:
+    """Incremental parser for the 'word, meaning, examples' line format"""
+
+    def __init__(self, parse_text: Callable[[str], Dict[str, Dict[str, str]]]):
+        self.parse_text = parse_text
+        self._buffer = ''
+
+    def feed(self, text: str) -> List[Entry]:
+        """Add a chunk of text and return entries of all completed lines"""
+        self._buffer += text
+        if '\n' not in self._buffer:
+            return []
+        complete, self._buffer = self._buffer.rsplit('\n', 1)
+        return list(self.parse_text(complete).items())
+
+    def close(self) -> List[Entry]:
+        """Parse the trailing line once the stream has ended"""
+        rest, self._buffer = self._buffer, ''
+        return list(self.parse_text(rest).items()) if rest.strip() else []
+
+class JSONArrayStreamParser:
+    """Incremental parser for a JSON array of {word, meanings, examples} objects"""
+
+    def __init__(self, validate_entry: Callable[[object, int], Tuple[Optional[Entry], Optional[str]]]):
+        self.validate_entry = validate_entry
+        self._index = 0
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._started = False
+        self.errors: List[str] = []
+
+    def _skip(self, chars: str):
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in chars:
+            self._pos += 1
+
+    def feed(self, text: str) -> List[Entry]:
+        """Add a chunk of text and return entries of all completed objects"""
+        self._buffer += text
+        entries = []
+
+        if not self._started:
+            self._skip(' \t\r\n')
+            if self._pos >= len(self._buffer):
+                return entries
+            if self._buffer[self._pos] != '[':
+                self.errors.append("Response is not a JSON array")
+                self._pos = len(self._buffer)
+                return entries
+            self._pos += 1
+            self._started = True
+
+        while True:
+            self._skip(' \t\r\n,')
+            if self._pos >= len(self._buffer) or self._buffer[self._pos] == ']':
+                break
+            try:
+                obj, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                break  # Object not complete yet
+            self._pos = end
+            entry, error = self.validate_entry(obj, self._index)
+            self._index += 1
+            if error:
+                self.errors.append(error)
+            if entry:
+                entries.append(entry)
+
+        # Drop consumed text so the buffer stays small
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        return entries
+
+    def close(self) -> List[Entry]:
+        """Report leftover text once the stream has ended"""
+        rest = self._buffer.strip()
+        self._buffer = ''
+        if rest and rest != ']':
+            self.errors.append("Response ended inside a JSON entry (truncated or malformed)")
+        return []
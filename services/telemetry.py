@@ -0,0 +1,181 @@
+"""
+Telemetry
+Records every Gemini call (operation, key, batch size, tokens, latency,
+retries, parse success) in an in-memory ring buffer with rolling
+percentiles, and optionally appends each record to a JSONL file
+"""
+
+import json
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional
+from utils.settings_manager import get_settings_manager
+
+# Records kept in memory for rolling statistics
+TELEMETRY_CAPACITY = 2000
+
+# Width of the batch size groups shown in stats
+BATCH_SIZE_BUCKET = 10
+
+# USD per 1M (input, output) tokens, used for cost estimates
+MODEL_PRICES = {
+    "gemini-2.5-flash": (0.30, 2.50),
+}
+
+class CallRecord(NamedTuple):
+    timestamp: float
+    operation: str  # "extract" or "meanings"
+    model: str
+    key_id: str
+    batch_size: int  # Words requested (1 per extraction chunk)
+    prompt_tokens: Optional[int]
+    response_tokens: Optional[int]
+    latency: float  # Seconds
+    retries: int
+    parsed: int  # Words that came back usable (extraction: 1 if the chunk gave words)
+    error: Optional[str] = None
+
+    @property
+    def cost(self) -> float:
+        """Estimated cost in USD (0 if the model or token counts are unknown)"""
+        input_price, output_price = MODEL_PRICES.get(self.model, (0.0, 0.0))
+        return ((self.prompt_tokens or 0) * input_price + (self.response_tokens or 0) * output_price) / 1_000_000
+
+def key_id(api_key: str) -> str:
+    """Short, non-secret label for an API key"""
+    return f"****{api_key[-4:]}" if api_key else "none"
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class Telemetry:
+    def __init__(self, capacity: int = TELEMETRY_CAPACITY, sink_path: Optional[str] = None):
+        self._records = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.sink_path = sink_path
+        self._sink_lines: List[str] = []  # Written to the sink outside the records lock
+        self._sink_lock = threading.Lock()
+
+    def record(self, operation: str, model: str, api_key: str, batch_size: int,
+               usage=None, latency: float = 0.0, retries: int = 0, parsed: int = 0,
+               error: Optional[BaseException] = None) -> CallRecord:
+        """Record one API call; usage is the response's usage_metadata, if any"""
+        record = CallRecord(
+            timestamp=time.time(),
+            operation=operation,
+            model=model,
+            key_id=key_id(api_key),
+            batch_size=batch_size,
+            prompt_tokens=getattr(usage, 'prompt_token_count', None),
+            response_tokens=getattr(usage, 'candidates_token_count', None),
+            latency=latency,
+            retries=retries,
+            parsed=parsed,
+            # Cancellations and timeouts have no message; keep their type
+            error=(str(error) or type(error).__name__)[:200] if error is not None else None,
+        )
+        with self._lock:
+            self._records.append(record)
+            if self.sink_path:
+                self._sink_lines.append(json.dumps(record._asdict(), ensure_ascii=False) + '\n')
+        if self.sink_path:
+            self._write_sink()
+        return record
+
+    def _write_sink(self):
+        """Append buffered records to the JSONL sink, in order, without blocking readers"""
+        with self._sink_lock:
+            with self._lock:
+                lines, self._sink_lines = self._sink_lines, []
+            if not lines:
+                return  # Written by another thread already
+            try:
+                with open(self.sink_path, 'a', encoding='utf-8') as f:
+                    f.writelines(lines)
+            except OSError as e:
+                print(f"Error writing telemetry: {e}")
+
+    def records(self) -> List[CallRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    @staticmethod
+    def summarize(records: List[CallRecord]) -> Dict[str, float]:
+        """Call count, latency p50/p95, error count, parse rate, tokens and cost"""
+        latencies = sorted(r.latency for r in records)
+        requested = sum(r.batch_size for r in records)
+        return {
+            'calls': len(records),
+            'p50': percentile(latencies, 0.50),
+            'p95': percentile(latencies, 0.95),
+            'errors': sum(1 for r in records if r.error),
+            'retries': sum(r.retries for r in records),
+            'parse_rate': sum(r.parsed for r in records) / requested if requested else 0.0,
+            'tokens': sum((r.prompt_tokens or 0) + (r.response_tokens or 0) for r in records),
+            'cost': sum(r.cost for r in records),
+        }
+
+    def stats_by(self, field: str, operation: Optional[str] = None,
+                 bucket: int = 1) -> Dict[object, Dict[str, float]]:
+        """
+        Rolling statistics grouped by a CallRecord field (e.g. 'key_id', 'batch_size')
+        bucket rounds numeric fields down to groups of that width
+        """
+        groups: Dict[object, List[CallRecord]] = {}
+        for record in self.records():
+            if operation is None or record.operation == operation:
+                value = getattr(record, field)
+                if bucket > 1:
+                    value = value // bucket * bucket
+                groups.setdefault(value, []).append(record)
+        return {value: self.summarize(records) for value, records in groups.items()}
+
+    def stats_text(self) -> str:
+        """Per-key and per-batch-size summary for display"""
+        by_key = self.stats_by('key_id')
+        if not by_key:
+            return "No API calls recorded yet"
+        lines = []
+        for key, stats in sorted(by_key.items()):
+            lines.append(
+                f"{key}: {stats['calls']} calls, p50 {stats['p50']:.1f}s, p95 {stats['p95']:.1f}s, "
+                f"{stats['errors']} errors, ${stats['cost']:.4f}"
+            )
+        by_size = self.stats_by('batch_size', operation='meanings', bucket=BATCH_SIZE_BUCKET)
+        if by_size:
+            lines.append("Meaning batches:")
+            for size, stats in sorted(by_size.items()):
+                lines.append(
+                    f"  {size}-{size + BATCH_SIZE_BUCKET - 1} words: {stats['calls']} calls, p50 {stats['p50']:.1f}s, "
+                    f"p95 {stats['p95']:.1f}s, parsed {stats['parse_rate']:.0%}"
+                )
+        return '\n'.join(lines)
+
+# Singleton instance
+_telemetry_instance = None
+_telemetry_lock = threading.Lock()
+
+def get_telemetry() -> Telemetry:
+    """
+    Get process-wide Telemetry; the JSONL sink path comes from settings
+
+    Usage:
+        from services.telemetry import get_telemetry
+
+        print(get_telemetry().stats_text())
+    """
+    global _telemetry_instance
+    with _telemetry_lock:
+        if _telemetry_instance is None:
+            _telemetry_instance = Telemetry(sink_path=get_settings_manager().get_telemetry_log_path())
+    return _telemetry_instance
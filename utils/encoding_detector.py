@@ -0,0 +1,127 @@
+"""
+Encoding Detector
+Picks a text codec for subtitle files from the BOM and a bounded byte sample
+The file is opened once and the same buffered stream is decoded
+"""
+
+import codecs
+import io
+from typing import Optional, TextIO
+
+SAMPLE_SIZE = 64 * 1024
+
+_BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+# Share of words with Arabic letters that must be Arabic-only to pick cp1256
+ARABIC_WORD_SHARE = 0.8
+
+# Bytes that are undefined in cp1252 but are letters in cp1256
+_CP1252_UNDEFINED = {0x81, 0x8D, 0x8F, 0x90, 0x9D}
+
+def _is_utf8(sample: bytes) -> bool:
+    """Check if sample is valid utf-8, allowing a cut-off trailing character"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        decoder.decode(sample, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+# High bytes of utf-16 code units for ASCII (0x00) and the Arabic block (0x06)
+_UTF16_HIGH_BYTES = {0x00, 0x06}
+
+def _count_high_bytes(data: bytes) -> int:
+    return sum(1 for b in data if b in _UTF16_HIGH_BYTES)
+
+def _guess_utf16(sample: bytes) -> Optional[str]:
+    """
+    Detect BOM-less utf-16 from the position of high bytes
+    Persian/Arabic text has no zero bytes but 0x06 in every high byte,
+    and its low bytes would also pass as ASCII in the utf-8 check
+    """
+    if len(sample) < 4:
+        return None
+    sample = sample[:len(sample) // 2 * 2]
+    even_high = _count_high_bytes(sample[0::2])
+    odd_high = _count_high_bytes(sample[1::2])
+    half = len(sample) // 2
+    if odd_high > half * 0.3 and even_high < half * 0.05:
+        encoding = 'utf-16-le'
+    elif even_high > half * 0.3 and odd_high < half * 0.05:
+        encoding = 'utf-16-be'
+    else:
+        return None
+    # Confirm with a strict decode; the sample may end inside a surrogate pair
+    decoder = codecs.getincrementaldecoder(encoding)()
+    try:
+        decoder.decode(sample, final=False)
+    except UnicodeDecodeError:
+        return None
+    return encoding
+
+def _is_arabic_letter(c: str) -> bool:
+    return '\u0600' <= c <= '\u06ff' and c.isalpha()
+
+def _is_latin_letter(c: str) -> bool:
+    return c.isalpha() and c <= '\u024f'
+
+def _looks_arabic(sample: bytes) -> bool:
+    """
+    Check if sample read as cp1256 is Persian/Arabic text
+    Accented letters of cp1252 text (á í ñ å ...) also land in the Arabic
+    block when read as cp1256, but inside Latin words ("aquي", "seًor");
+    real Persian/Arabic words consist of Arabic letters only
+    """
+    text = sample.decode('cp1256', errors='ignore')
+    arabic_words = mixed_words = 0
+    for word in text.split():
+        if not any(_is_arabic_letter(c) for c in word):
+            continue
+        if any(_is_latin_letter(c) for c in word):
+            mixed_words += 1
+        else:
+            arabic_words += 1
+    return arabic_words >= 3 and arabic_words >= ARABIC_WORD_SHARE * (arabic_words + mixed_words)
+
+def detect_encoding(sample: bytes) -> str:
+    """
+    Pick an encoding for the given leading bytes of a file
+    Returns a codec name usable with open()/TextIOWrapper
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    utf16 = _guess_utf16(sample)
+    if utf16:
+        return utf16
+
+    if _is_utf8(sample):
+        return 'utf-8'
+
+    if any(b in _CP1252_UNDEFINED for b in sample):
+        return 'cp1256'
+
+    # Persian/Arabic subtitles are made of whole Arabic-script words
+    if _looks_arabic(sample):
+        return 'cp1256'
+
+    return 'cp1252'
+
+def open_text(file_path: str, sample_size: int = SAMPLE_SIZE) -> TextIO:
+    """
+    Open a file once, sniff its encoding and return a decoded text stream
+    Undecodable bytes later in the file are replaced instead of raising
+    """
+    raw = open(file_path, 'rb', buffering=sample_size)
+    try:
+        sample = raw.peek(sample_size)[:sample_size]
+        encoding = detect_encoding(sample)
+        return io.TextIOWrapper(raw, encoding=encoding, errors='replace')
+    except Exception:
+        raw.close()
+        raise
@@ -6,6 +6,7 @@ Helper functions for file operations
 import os
 import shutil
 from typing import Optional
+from utils.encoding_detector import open_text
 
 class FileHandler:
     @staticmethod
@@ -72,21 +73,17 @@ class FileHandler:
             return None
     
     @staticmethod
-    def read_file_content(file_path: str, encoding: str = 'utf-8') -> Optional[str]:
+    def read_file_content(file_path: str, encoding: Optional[str] = None) -> Optional[str]:
         """
         Read file content as string
+        The encoding is detected from the file unless given explicitly
         """
         try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                return f.read()
-        except UnicodeDecodeError:
-            # Try with different encoding
-            try:
-                with open(file_path, 'r', encoding='latin-1') as f:
+            if encoding:
+                with open(file_path, 'r', encoding=encoding) as f:
                     return f.read()
-            except Exception as e:
-                print(f"Error reading file: {e}")
-                return None
+            with open_text(file_path) as f:
+                return f.read()
         except Exception as e:
             print(f"Error reading file: {e}")
             return None
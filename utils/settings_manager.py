@@ -6,9 +6,16 @@ Stores settings in JSON format with rotation support
 
 import json
 import os
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import threading
 
+# Top N words of the bundled frequency table treated as known
+DEFAULT_COMMON_WORDS_THRESHOLD = 200
+
+# Per-key rate limits used by the key scheduler (Gemini free tier)
+DEFAULT_KEY_REQUESTS_PER_MINUTE = 10
+DEFAULT_KEY_TOKENS_PER_MINUTE = 250000
+
 class SettingsManager:
     def __init__(self, settings_file: str = "settings.json"):
         self.settings_file = settings_file
@@ -106,6 +113,15 @@ class SettingsManager:
             
             return key
     
+    def get_key_rate_limits(self) -> Tuple[int, int]:
+        """Get per-key (requests per minute, tokens per minute) limits"""
+        try:
+            rpm = int(self.settings.get("key_requests_per_minute", DEFAULT_KEY_REQUESTS_PER_MINUTE))
+            tpm = int(self.settings.get("key_tokens_per_minute", DEFAULT_KEY_TOKENS_PER_MINUTE))
+        except (TypeError, ValueError):
+            return DEFAULT_KEY_REQUESTS_PER_MINUTE, DEFAULT_KEY_TOKENS_PER_MINUTE
+        return max(1, rpm), max(1, tpm)
+    
     def get_api_key_count(self) -> int:
         """Get number of API keys"""
         return len(self.settings.get("api_keys", []))
@@ -145,7 +161,14 @@ class SettingsManager:
             "theme": "Light",
             "language": "en",
             "srt_language": "English",  # NEW: Source language of SRT files
-            "translate_language": "Persian"  # NEW: Target language for translations
+            "translate_language": "Persian",  # NEW: Target language for translations
+            "common_words_threshold": DEFAULT_COMMON_WORDS_THRESHOLD,
+            "key_requests_per_minute": DEFAULT_KEY_REQUESTS_PER_MINUTE,
+            "key_tokens_per_minute": DEFAULT_KEY_TOKENS_PER_MINUTE,
+            "meanings_batch_sizes": {},
+            "telemetry_log_path": None,
+            "dictionary_path": None,
+            "database_profile": "default"
         }
 
     # Add these new methods after the language management section:
@@ -172,6 +195,85 @@ class SettingsManager:
         self.settings["translate_language"] = language
         return self.save_settings()
 
+    # Common Words Threshold
+
+    def get_common_words_threshold(self) -> int:
+        """Get N where the top N most frequent words are treated as known"""
+        try:
+            return max(0, int(self.settings.get("common_words_threshold", DEFAULT_COMMON_WORDS_THRESHOLD)))
+        except (TypeError, ValueError):
+            return DEFAULT_COMMON_WORDS_THRESHOLD
+
+    def set_common_words_threshold(self, threshold: int) -> bool:
+        """Set common words threshold (0 disables it)"""
+        if threshold < 0:
+            return False
+        self.settings["common_words_threshold"] = threshold
+        return self.save_settings()
+
+    # Offline Dictionary
+
+    def get_dictionary_path(self) -> Optional[str]:
+        """Get the local TSV/StarDict dictionary consulted before Gemini (None = none)"""
+        return self.settings.get("dictionary_path") or None
+
+    def set_dictionary_path(self, path: Optional[str]) -> bool:
+        """Set the local dictionary file, or None to stop using one"""
+        if path and not os.path.exists(path):
+            return False
+        self.settings["dictionary_path"] = path or None
+        return self.save_settings()
+
+    # Database Profile
+
+    def get_database_profile(self) -> str:
+        """Get the database profile: 'default' or 'performance' (WAL + single writer thread)"""
+        profile = self.settings.get("database_profile", "default")
+        return profile if profile in ("default", "performance") else "default"
+
+    def set_database_profile(self, profile: str) -> bool:
+        """Set the database profile (takes effect on the next launch)"""
+        if profile not in ("default", "performance"):
+            return False
+        self.settings["database_profile"] = profile
+        return self.save_settings()
+
+    # Telemetry
+
+    def get_telemetry_log_path(self) -> Optional[str]:
+        """Get the JSONL file API call records are appended to (None = memory only)"""
+        return self.settings.get("telemetry_log_path") or None
+
+    def set_telemetry_log_path(self, path: Optional[str]) -> bool:
+        """Set the telemetry JSONL file, or None to stop writing one"""
+        self.settings["telemetry_log_path"] = path or None
+        return self.save_settings()
+
+    # Learned Meaning Batch Sizes
+
+    @staticmethod
+    def _batch_size_key(model: str, srt_language: str, translate_language: str) -> str:
+        return f"{model}|{srt_language.lower()}|{translate_language.lower()}"
+
+    def get_meanings_batch_size(self, model: str, srt_language: str, translate_language: str) -> Optional[int]:
+        """Get the batch size learned for a model and language pair, if any"""
+        sizes = self.settings.get("meanings_batch_sizes", {})
+        try:
+            size = int(sizes[self._batch_size_key(model, srt_language, translate_language)])
+        except (KeyError, TypeError, ValueError):
+            return None
+        return size if size > 0 else None
+
+    def set_meanings_batch_size(self, model: str, srt_language: str, translate_language: str, size: int) -> bool:
+        """Remember the batch size learned for a model and language pair"""
+        with self._lock:
+            sizes = self.settings.setdefault("meanings_batch_sizes", {})
+            key = self._batch_size_key(model, srt_language, translate_language)
+            if sizes.get(key) == size:
+                return True
+            sizes[key] = size
+            return self.save_settings()
+
 
 # Singleton instance
 _settings_manager_instance = None
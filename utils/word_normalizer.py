@@ -0,0 +1,19 @@
+"""
+Word Normalizer
+Single normalization used wherever words are compared or used as keys
+"""
+
+import re
+
+_EDGE_PUNCTUATION = re.compile(r"^[\W_]+|[\W_]+$")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_word(word: str) -> str:
+    """
+    Normalize a word for lookups: trim, drop surrounding punctuation,
+    collapse inner whitespace and lower-case
+    """
+    if not word:
+        return ''
+    word = _EDGE_PUNCTUATION.sub('', word.strip())
+    return _WHITESPACE.sub(' ', word).lower()
@@ -14,6 +14,7 @@ a = Analysis(
     binaries=[],
     datas=[
         ('fonts', 'fonts'),  # Include fonts folder
+        ('data', 'data'),  # Include word frequency tables
     ],
     hiddenimports=[
         'kivymd',